@@ -94,6 +94,11 @@ DB_NAME = os.getenv('DB_NAME', 'autoapply')
 DB_USER = os.getenv('DB_USER', 'postgres')
 DB_PASSWORD = os.getenv('DB_PASSWORD', '')
 
+# Keep connections open between requests instead of reconnecting every time.
+# Each gunicorn worker holds at most one connection; health checks replace
+# connections the server has closed in the meantime.
+DB_CONN_MAX_AGE = int(os.getenv('DB_CONN_MAX_AGE', '600'))
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
@@ -102,6 +107,8 @@ DATABASES = {
         'PASSWORD': DB_PASSWORD,
         'HOST': DB_HOST,
         'PORT': DB_PORT,
+        'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+        'CONN_HEALTH_CHECKS': True,
         'OPTIONS': {
             'connect_timeout': 10,
         },
@@ -109,6 +116,33 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+# With REDIS_URL set (docker-compose runs a redis service for it), all workers
+# and the scheduler share one cache, so invalidations are seen everywhere.
+# Without it each process keeps its own in-memory cache.
+REDIS_URL = os.getenv('REDIS_URL')
+
+# Caches of database rows across requests are only used with a shared cache;
+# a per-process cache would keep serving rows another process changed or deleted
+SHARED_CACHE = bool(REDIS_URL)
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -18,8 +18,10 @@ class UserProfileInline(admin.StackedInline):
 class UserProfileAdmin(admin.ModelAdmin):
     """Admin interface for UserProfile model."""
     list_display = ('user', 'phone_number', 'city', 'country', 'updated_at')
+    list_select_related = ('user',)
     list_filter = ('country', 'created_at', 'updated_at')
     search_fields = ('user__username', 'user__email', 'phone_number', 'city', 'street')
+    autocomplete_fields = ('user',)
     readonly_fields = ('created_at', 'updated_at')
     fieldsets = (
         ('User', {
@@ -42,6 +44,10 @@ class UserProfileAdmin(admin.ModelAdmin):
 class UserAdmin(BaseUserAdmin):
     """Extended User admin with profile inline."""
     inlines = (UserProfileInline,)
+    
+    def get_queryset(self, request):
+        """Load the profile together with each user."""
+        return super().get_queryset(request).select_related('profile')
 
 
 # Unregister default User admin and register with profile
@@ -0,0 +1,36 @@
+from django.contrib.auth import get_user_model
+from django.utils.translation import gettext_lazy as _
+from ninja_jwt.authentication import JWTAuth
+from ninja_jwt.exceptions import AuthenticationFailed, InvalidToken
+from ninja_jwt.settings import api_settings
+
+User = get_user_model()
+
+
+class CachedJWTAuth(JWTAuth):
+    """
+    JWT authentication that loads the user together with its one-to-one relations.
+
+    The profile and document status are joined into the user lookup, so
+    endpoints can read `request.auth.profile` / `request.auth.document_status`
+    without issuing additional queries.
+    """
+
+    def get_user(self, validated_token):
+        """Return the active user for the token with profile and document status joined."""
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        try:
+            user = User.objects.select_related('profile', 'document_status').get(
+                **{api_settings.USER_ID_FIELD: user_id}
+            )
+        except User.DoesNotExist as e:
+            raise AuthenticationFailed(_("User not found")) from e
+
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"))
+
+        return user
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:39
+
+import django.core.validators
+import re
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='userprofile',
+            name='phone_number',
+            field=models.CharField(blank=True, help_text='Phone number in international format', max_length=20, null=True, validators=[django.core.validators.RegexValidator(message="Phone number must be entered in the format: '+999999999'. Up to 15 digits allowed.", regex=re.compile('^\\+?1?\\d{9,15}$'))]),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated manually - Index auth_user.email for case-insensitive lookups
+# Note: Django compiles `email__iexact` to UPPER("email") = UPPER(%s) on PostgreSQL,
+# so the expression index uses UPPER to be usable by those queries.
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0002_alter_userprofile_phone_number'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="CREATE INDEX IF NOT EXISTS user_email_upper_idx ON auth_user (UPPER(email));",
+            reverse_sql="DROP INDEX IF EXISTS user_email_upper_idx;",
+        ),
+    ]
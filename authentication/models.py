@@ -1,9 +1,13 @@
 from django.db import models
 from django.contrib.auth import get_user_model
 from django.core.validators import RegexValidator
+import re
 
 User = get_user_model()
 
+# Compiled once per process and shared by every phone number validation
+PHONE_NUMBER_RE = re.compile(r'^\+?1?\d{9,15}$')
+
 
 class Country(models.TextChoices):
     """Country enumeration."""
@@ -50,6 +54,11 @@ class Country(models.TextChoices):
     VIETNAM = "VN", "Vietnam"
 
 
+# Lookup tables built once at import time
+COUNTRY_DISPLAY = dict(Country.choices)
+VALID_COUNTRY_CODES = frozenset(COUNTRY_DISPLAY)
+
+
 class UserProfile(models.Model):
     """Extended user profile with additional personal information."""
     
@@ -65,7 +74,7 @@ class UserProfile(models.Model):
         null=True,
         validators=[
             RegexValidator(
-                regex=r'^\+?1?\d{9,15}$',
+                regex=PHONE_NUMBER_RE,
                 message="Phone number must be entered in the format: '+999999999'. Up to 15 digits allowed."
             )
         ],
@@ -74,11 +83,13 @@ class UserProfile(models.Model):
     street = models.CharField(max_length=255, blank=True, null=True)
     city = models.CharField(max_length=100, blank=True, null=True)
     postcode = models.CharField(max_length=20, blank=True, null=True)
+    # Low-cardinality and never filtered on, so deliberately left unindexed
     country = models.CharField(
         max_length=2,
         choices=Country.choices,
         blank=True,
-        null=True
+        null=True,
+        db_index=False
     )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -103,10 +114,3 @@ def create_user_profile(sender, instance, created, **kwargs):
     """Create a profile automatically when a user is created."""
     if created:
         UserProfile.objects.get_or_create(user=instance)
-
-
-@receiver(post_save, sender=User)
-def save_user_profile(sender, instance, **kwargs):
-    """Save the profile when user is saved."""
-    if hasattr(instance, 'profile'):
-        instance.profile.save()
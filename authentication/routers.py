@@ -1,11 +1,16 @@
 from ninja import Router
+from django.conf import settings
 from django.contrib.auth import authenticate, get_user_model
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.http import HttpResponse
 from ninja.errors import HttpError
-from ninja_jwt.authentication import JWTAuth
+from ninja_jwt.exceptions import TokenError
+from ninja_jwt import settings as jwt_settings
 from ninja_jwt.tokens import RefreshToken, AccessToken
-from .models import UserProfile, Country
+from .auth import CachedJWTAuth
+from .models import UserProfile, Country, COUNTRY_DISPLAY, VALID_COUNTRY_CODES
 from .schemas import (
     RegisterSchema,
     LoginSchema,
@@ -22,6 +27,30 @@ from .schemas import (
 User = get_user_model()
 router = Router(tags=["authentication"])
 
+# RefreshToken only provides blacklist() when the blacklist app is installed
+TOKEN_BLACKLIST_ENABLED = "ninja_jwt.token_blacklist" in settings.INSTALLED_APPS
+
+# The country list never changes at runtime; build the response once
+_COUNTRIES_RESPONSE = CountriesListSchema(countries=[
+    CountryOptionSchema(code=code, name=name)
+    for code, name in Country.choices
+])
+_COUNTRIES_CACHE_CONTROL = "public, max-age=86400, immutable"
+
+
+def _get_profile(user):
+    """
+    Return the user's profile.
+    
+    The profile is normally joined by CachedJWTAuth; accounts created before
+    the profile signal existed get one created on first access.
+    """
+    try:
+        return user.profile
+    except UserProfile.DoesNotExist:
+        profile, created = UserProfile.objects.get_or_create(user=user)
+        return profile
+
 
 @router.post(
     "/register",
@@ -35,12 +64,17 @@ def register(request, payload: RegisterSchema):
     
     Creates a new user account and returns JWT access and refresh tokens.
     """
-    # Check if username already exists
-    if User.objects.filter(username=payload.username).exists():
+    # Check if username or email already exist in a single query
+    conflicts = list(
+        User.objects.filter(
+            Q(username=payload.username) | Q(email__iexact=payload.email)
+        ).values_list('username', 'email')
+    )
+    
+    if any(username == payload.username for username, _ in conflicts):
         raise HttpError(400, "Username already exists")
     
-    # Check if email already exists
-    if User.objects.filter(email=payload.email).exists():
+    if any(email.lower() == payload.email.lower() for _, email in conflicts):
         raise HttpError(400, "Email already exists")
     
     # Check if passwords match
@@ -130,35 +164,61 @@ def refresh_token(request, payload: RefreshTokenSchema):
     """
     Refresh access token.
     
-    Returns a new access token using a valid refresh token.
+    Returns a new access token using a valid refresh token. The refresh token
+    itself is only re-issued when token rotation is enabled; the presented one
+    is then blacklisted if BLACKLIST_AFTER_ROTATION is set and the
+    ninja_jwt.token_blacklist app is installed.
     """
+    # Looked up per call, ninja_jwt rebuilds it when SIMPLE_JWT changes
+    api_settings = jwt_settings.api_settings
+    
     try:
-        refresh_token = RefreshToken(payload.refresh)
-        user = refresh_token.user
-        
-        # Generate new tokens
-        new_refresh = RefreshToken.for_user(user)
-        new_access = new_refresh.access_token
-        
+        refresh = RefreshToken(payload.refresh)
+    except TokenError:
+        raise HttpError(401, "Invalid or expired refresh token")
+    
+    # Only the fields returned to the client are loaded
+    user = User.objects.filter(
+        is_active=True,
+        **{api_settings.USER_ID_FIELD: refresh.get(api_settings.USER_ID_CLAIM)},
+    ).values('id', 'username', 'email', 'first_name', 'last_name').first()
+    
+    if user is None:
+        raise HttpError(401, "Invalid or expired refresh token")
+    
+    # The access token copies its claims from the refresh token
+    access = refresh.access_token
+    
+    if not api_settings.ROTATE_REFRESH_TOKENS:
         return TokenResponseSchema(
-            access=str(new_access),
-            refresh=str(new_refresh),
-            user={
-                "id": user.id,
-                "username": user.username,
-                "email": user.email,
-                "first_name": user.first_name,
-                "last_name": user.last_name,
-            }
+            access=str(access),
+            refresh=payload.refresh,
+            user=user,
         )
-    except Exception as e:
-        raise HttpError(401, "Invalid or expired refresh token")
+    
+    if api_settings.BLACKLIST_AFTER_ROTATION:
+        try:
+            refresh.blacklist()
+        except AttributeError:
+            # blacklist() only exists with the token_blacklist app installed
+            pass
+    
+    # Rotate by re-issuing the same refresh token with a new jti and lifetime
+    refresh.set_jti()
+    refresh.set_exp()
+    refresh.set_iat()
+    
+    return TokenResponseSchema(
+        access=str(access),
+        refresh=str(refresh),
+        user=user,
+    )
 
 
 @router.get(
     "/me",
     response=UserSchema,
-    auth=JWTAuth(),
+    auth=CachedJWTAuth(),
     summary="Get current user",
     description="Get information about the currently authenticated user"
 )
@@ -184,7 +244,7 @@ def get_current_user(request):
 @router.post(
     "/logout",
     response={200: MessageSchema},
-    auth=JWTAuth(),
+    auth=CachedJWTAuth(),
     summary="Logout user",
     description="Invalidate the current refresh token (if using token blacklist)"
 )
@@ -192,20 +252,25 @@ def logout(request, payload: RefreshTokenSchema):
     """
     Logout user.
     
-    Invalidates the refresh token. Note: This requires token blacklist to be enabled.
+    Invalidates the refresh token. Note: This requires token blacklist to be enabled;
+    without it the token is only validated and nothing is written to the database.
     """
     try:
         refresh_token = RefreshToken(payload.refresh)
-        refresh_token.blacklist()
-        return MessageSchema(message="Successfully logged out")
-    except Exception as e:
+    except TokenError:
         raise HttpError(400, "Invalid refresh token")
+    
+    if TOKEN_BLACKLIST_ENABLED:
+        # blacklist() uses get_or_create, so repeated logouts are no-ops
+        refresh_token.blacklist()
+    
+    return MessageSchema(message="Successfully logged out")
 
 
 @router.get(
     "/profile",
     response=UserProfileSchema,
-    auth=JWTAuth(),
+    auth=CachedJWTAuth(),
     summary="Get user profile",
     description="Get the current user's profile information"
 )
@@ -216,12 +281,12 @@ def get_user_profile(request):
     Returns the complete profile information for the authenticated user.
     """
     user = request.auth
-    profile, created = UserProfile.objects.get_or_create(user=user)
+    profile = _get_profile(user)
     
     # Get country display name
     country_display = None
     if profile.country:
-        country_display = dict(Country.choices).get(profile.country)
+        country_display = COUNTRY_DISPLAY.get(profile.country)
     
     return UserProfileSchema(
         id=user.id,
@@ -244,7 +309,7 @@ def get_user_profile(request):
 @router.put(
     "/profile",
     response=UserProfileSchema,
-    auth=JWTAuth(),
+    auth=CachedJWTAuth(),
     summary="Update user profile",
     description="Update the current user's profile information"
 )
@@ -256,49 +321,63 @@ def update_user_profile(request, payload: UserProfileUpdateSchema):
     Only provided fields will be updated.
     """
     user = request.auth
-    profile, created = UserProfile.objects.get_or_create(user=user)
+    profile = _get_profile(user)
     
     # Update user fields
+    user_fields = []
+    
     if payload.email is not None:
         # Check if email is already taken by another user
-        if User.objects.filter(email=payload.email).exclude(id=user.id).exists():
+        if User.objects.filter(email__iexact=payload.email).exclude(id=user.id).exists():
             raise HttpError(400, "Email address is already in use")
         user.email = payload.email
+        user_fields.append('email')
     
     if payload.first_name is not None:
         user.first_name = payload.first_name
+        user_fields.append('first_name')
     
     if payload.last_name is not None:
         user.last_name = payload.last_name
+        user_fields.append('last_name')
     
-    user.save()
+    if user_fields:
+        user.save(update_fields=user_fields)
     
     # Update profile fields
+    profile_fields = []
+    
     if payload.phone_number is not None:
         profile.phone_number = payload.phone_number
+        profile_fields.append('phone_number')
     
     if payload.street is not None:
         profile.street = payload.street
+        profile_fields.append('street')
     
     if payload.city is not None:
         profile.city = payload.city
+        profile_fields.append('city')
     
     if payload.postcode is not None:
         profile.postcode = payload.postcode
+        profile_fields.append('postcode')
     
     if payload.country is not None:
         # Validate country code
-        valid_countries = [code for code, _ in Country.choices]
-        if payload.country not in valid_countries:
-            raise HttpError(400, f"Invalid country code. Must be one of: {', '.join(valid_countries)}")
+        if payload.country not in VALID_COUNTRY_CODES:
+            raise HttpError(400, f"Invalid country code. Must be one of: {', '.join(COUNTRY_DISPLAY)}")
         profile.country = payload.country
+        profile_fields.append('country')
     
-    profile.save()
+    # Only write the columns that were provided
+    if profile_fields:
+        profile.save(update_fields=profile_fields + ['updated_at'])
     
     # Get country display name
     country_display = None
     if profile.country:
-        country_display = dict(Country.choices).get(profile.country)
+        country_display = COUNTRY_DISPLAY.get(profile.country)
     
     return UserProfileSchema(
         id=user.id,
@@ -325,14 +404,12 @@ def update_user_profile(request, payload: UserProfileUpdateSchema):
     summary="Get available countries",
     description="Get a list of all available countries for user profiles"
 )
-def get_countries(request):
+def get_countries(request, response: HttpResponse):
     """
     Get available countries.
     
     Returns a list of all available countries that can be used in user profiles.
+    The list is static for the lifetime of the process, so clients may cache it.
     """
-    countries = [
-        CountryOptionSchema(code=code, name=name)
-        for code, name in Country.choices
-    ]
-    return CountriesListSchema(countries=countries)
+    response["Cache-Control"] = _COUNTRIES_CACHE_CONTROL
+    return _COUNTRIES_RESPONSE
@@ -1,3 +1,222 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from ninja_jwt.tokens import AccessToken, RefreshToken
+
+User = get_user_model()
+
+
+class AuthenticatedEndpointTest(TestCase):
+    """Test cases for endpoints authenticated with CachedJWTAuth"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.user = User.objects.create_user(
+            username="testuser",
+            email="test@example.com",
+            password="Sup3r-secret-pass",
+        )
+        access = RefreshToken.for_user(self.user).access_token
+        self.auth_header = {"HTTP_AUTHORIZATION": f"Bearer {access}"}
+
+    def test_profile_loaded_with_user(self):
+        """Test the profile is joined into the authentication query"""
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/auth/profile", **self.auth_header)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["username"], "testuser")
+
+    def test_document_status_created_lazily(self):
+        """Test document status is available for users without an upload"""
+        response = self.client.get("/api/documents/status", **self.auth_header)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.json()["has_uploaded_document"])
+
+
+class CountriesEndpointTest(TestCase):
+    """Test cases for the countries endpoint"""
+
+    def test_countries_cacheable(self):
+        """Test the static country list is served with cache headers"""
+        response = self.client.get("/api/auth/countries")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Cache-Control"], "public, max-age=86400, immutable")
+        self.assertIn({"code": "AT", "name": "Austria"}, response.json()["countries"])
+
+
+class RegisterEndpointTest(TestCase):
+    """Test cases for user registration"""
+
+    def setUp(self):
+        """Set up test data"""
+        User.objects.create_user(username="taken", email="taken@example.com", password="x")
+
+    def _register(self, username, email):
+        return self.client.post(
+            "/api/auth/register",
+            data={
+                "username": username,
+                "email": email,
+                "password": "Sup3r-secret-pass",
+                "password_confirm": "Sup3r-secret-pass",
+            },
+            content_type="application/json",
+        )
+
+    def test_duplicate_username_rejected(self):
+        """Test registering an existing username fails"""
+        response = self._register("taken", "other@example.com")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["detail"], "Username already exists")
+
+    def test_duplicate_email_rejected(self):
+        """Test registering an existing email fails"""
+        response = self._register("newuser", "taken@example.com")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["detail"], "Email already exists")
+
+    def test_duplicate_email_case_insensitive(self):
+        """Test emails differing only in case are treated as duplicates"""
+        response = self._register("newuser", "Taken@Example.com")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["detail"], "Email already exists")
+
+    def test_register_creates_user(self):
+        """Test registration creates the user and returns tokens"""
+        response = self._register("newuser", "new@example.com")
+        self.assertEqual(response.status_code, 201)
+        self.assertIn("access", response.json())
+        self.assertTrue(User.objects.filter(username="newuser").exists())
+
+
+class RefreshEndpointTest(TestCase):
+    """Test cases for access token refresh"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.user = User.objects.create_user(username="refresher", password="x")
+        self.refresh = str(RefreshToken.for_user(self.user))
+
+    def test_refresh_returns_new_tokens(self):
+        """Test a valid refresh token yields a new access token and user data"""
+        response = self.client.post(
+            "/api/auth/refresh",
+            data={"refresh": self.refresh},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["user"]["username"], "refresher")
+        self.assertEqual(AccessToken(data["access"])["user_id"], self.user.id)
+        self.assertEqual(RefreshToken(data["refresh"])["user_id"], self.user.id)
+
+    @mock.patch.object(RefreshToken, "blacklist", create=True)
+    def test_refresh_blacklists_rotated_token(self, mock_blacklist):
+        """Test the presented refresh token is blacklisted once it has been rotated"""
+        response = self.client.post(
+            "/api/auth/refresh",
+            data={"refresh": self.refresh},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.json()["refresh"], self.refresh)
+        mock_blacklist.assert_called_once_with()
+
+    @override_settings(SIMPLE_JWT={**settings.SIMPLE_JWT, "ROTATE_REFRESH_TOKENS": False})
+    @mock.patch.object(RefreshToken, "blacklist", create=True)
+    def test_refresh_without_rotation(self, mock_blacklist):
+        """Test the refresh token is returned unchanged when rotation is disabled"""
+        response = self.client.post(
+            "/api/auth/refresh",
+            data={"refresh": self.refresh},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["refresh"], self.refresh)
+        self.assertEqual(AccessToken(data["access"])["user_id"], self.user.id)
+        mock_blacklist.assert_not_called()
+
+    def test_refresh_rejects_invalid_token(self):
+        """Test an invalid refresh token is rejected"""
+        response = self.client.post(
+            "/api/auth/refresh",
+            data={"refresh": "not-a-token"},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 401)
+
+    def test_refresh_rejects_inactive_user(self):
+        """Test refresh fails once the user has been deactivated"""
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        response = self.client.post(
+            "/api/auth/refresh",
+            data={"refresh": self.refresh},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 401)
+
+
+class UpdateProfileEndpointTest(TestCase):
+    """Test cases for updating the user profile"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.user = User.objects.create_user(username="editor", password="x", first_name="Old")
+        access = RefreshToken.for_user(self.user).access_token
+        self.auth_header = {"HTTP_AUTHORIZATION": f"Bearer {access}"}
+
+    def _update(self, **data):
+        return self.client.put(
+            "/api/auth/profile",
+            data=data,
+            content_type="application/json",
+            **self.auth_header,
+        )
+
+    def test_partial_update(self):
+        """Test only the provided fields are changed"""
+        response = self._update(city="Vienna", country="AT")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["country_display"], "Austria")
+
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.first_name, "Old")
+        self.assertEqual(self.user.profile.city, "Vienna")
+        self.assertEqual(self.user.profile.country, "AT")
+
+    def test_invalid_country_rejected(self):
+        """Test unknown country codes are rejected"""
+        response = self._update(country="XX")
+        self.assertEqual(response.status_code, 400)
+
+
+class LogoutEndpointTest(TestCase):
+    """Test cases for logout"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.user = User.objects.create_user(username="leaver", password="x")
+        refresh = RefreshToken.for_user(self.user)
+        self.refresh = str(refresh)
+        self.auth_header = {"HTTP_AUTHORIZATION": f"Bearer {refresh.access_token}"}
+
+    def _logout(self, refresh):
+        return self.client.post(
+            "/api/auth/logout",
+            data={"refresh": refresh},
+            content_type="application/json",
+            **self.auth_header,
+        )
+
+    def test_logout_succeeds(self):
+        """Test logout accepts a valid refresh token"""
+        response = self._logout(self.refresh)
+        self.assertEqual(response.status_code, 200)
+
+    def test_logout_rejects_invalid_token(self):
+        """Test logout rejects an invalid refresh token"""
+        response = self._logout("not-a-token")
+        self.assertEqual(response.status_code, 400)
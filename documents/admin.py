@@ -5,6 +5,8 @@ from .models import UserDocumentStatus
 @admin.register(UserDocumentStatus)
 class UserDocumentStatusAdmin(admin.ModelAdmin):
     list_display = ('user', 'has_uploaded_document', 'last_upload_date', 'updated_at')
+    list_select_related = ('user',)
     list_filter = ('has_uploaded_document', 'last_upload_date')
     search_fields = ('user__username', 'user__email')
+    autocomplete_fields = ('user',)
     readonly_fields = ('created_at', 'updated_at')
@@ -3,6 +3,9 @@ Custom exception handlers for the documents app.
 """
 from django.core.exceptions import RequestDataTooBig
 from ninja.errors import HttpError
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 def handle_request_too_large(request, exc):
@@ -11,8 +14,11 @@ def handle_request_too_large(request, exc):
     
     This is called when a request exceeds DATA_UPLOAD_MAX_MEMORY_SIZE.
     """
-    print(f"[ERROR] Request too large from {request.META.get('REMOTE_ADDR', 'unknown')}")
-    print(f"[ERROR] RequestDataTooBig: {str(exc)}")
+    logger.error(
+        "Request too large from %s: %s",
+        request.META.get('REMOTE_ADDR', 'unknown'),
+        exc,
+    )
     
     return {
         "detail": "PDF file is too large. Maximum file size is 5MB. Please upload a smaller PDF."
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-15 23:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userdocumentstatus',
+            name='upload_error',
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='userdocumentstatus',
+            name='upload_status',
+            field=models.CharField(blank=True, choices=[('processing', 'Processing'), ('succeeded', 'Succeeded'), ('failed', 'Failed')], help_text='Outcome of the most recent upload', max_length=20, null=True),
+        ),
+    ]
@@ -1,4 +1,6 @@
 from django.db import models
+from django.utils import timezone
+from datetime import timedelta
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -7,6 +9,14 @@ User = get_user_model()
 class UserDocumentStatus(models.Model):
     """Track document upload status for users."""
     
+    class UploadStatus(models.TextChoices):
+        PROCESSING = "processing", "Processing"
+        SUCCEEDED = "succeeded", "Succeeded"
+        FAILED = "failed", "Failed"
+    
+    # Uploads still processing after this long were lost, e.g. to a restart
+    PROCESSING_TIMEOUT = timedelta(minutes=10)
+    
     user = models.OneToOneField(
         User,
         on_delete=models.CASCADE,
@@ -15,6 +25,14 @@ class UserDocumentStatus(models.Model):
     )
     has_uploaded_document = models.BooleanField(default=False)
     last_upload_date = models.DateTimeField(null=True, blank=True)
+    upload_status = models.CharField(
+        max_length=20,
+        choices=UploadStatus.choices,
+        null=True,
+        blank=True,
+        help_text="Outcome of the most recent upload"
+    )
+    upload_error = models.CharField(max_length=255, null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -25,3 +43,28 @@ class UserDocumentStatus(models.Model):
     
     def __str__(self):
         return f"Document status for {self.user.username}"
+
+    def current_upload_status(self):
+        """
+        Return the (upload_status, upload_error) to report for the latest upload.
+        
+        Background processing does not survive a restart, so an upload that is
+        still processing after PROCESSING_TIMEOUT is reported as failed.
+        """
+        if (
+            self.upload_status == self.UploadStatus.PROCESSING
+            and self.updated_at < timezone.now() - self.PROCESSING_TIMEOUT
+        ):
+            return self.UploadStatus.FAILED, "Processing was interrupted, please upload the document again"
+        return self.upload_status, self.upload_error
+    
+    @classmethod
+    def set_status(cls, user_id, **fields):
+        """
+        Write the given status fields for a user, creating the row if it is missing.
+
+        Usually a single UPDATE; the INSERT only runs for a user's first write.
+        update() skips auto_now, so updated_at is set explicitly.
+        """
+        if not cls.objects.filter(user_id=user_id).update(updated_at=timezone.now(), **fields):
+            cls.objects.create(user_id=user_id, **fields)
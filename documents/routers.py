@@ -1,116 +1,97 @@
 from ninja import Router
 from ninja.errors import HttpError
-from ninja_jwt.authentication import JWTAuth
+from authentication.auth import CachedJWTAuth
 from .models import UserDocumentStatus
 from .schemas import PDFUploadSchema, UploadResponseSchema, DocumentStatusSchema, DeleteDataResponseSchema
+from .tasks import UploadQueueFull, enqueue_pdf_upload
+from .webhooks import DELETE_WEBHOOK_URL, webhook_session
 import base64
-import io
-from pypdf import PdfReader
+import logging
 import requests
-from datetime import datetime
 from django.utils import timezone
 
+logger = logging.getLogger(__name__)
 router = Router(tags=["documents"])
 
+# 12 base64 characters decode to 9 bytes, enough to hold the '%PDF-' header
+PDF_HEADER_BASE64_LENGTH = 12
+
+
+def _get_document_status(user):
+    """
+    Return the user's document status.
+    
+    The status is normally joined by CachedJWTAuth; it is created lazily for
+    users who have never uploaded a document.
+    """
+    try:
+        return user.document_status
+    except UserDocumentStatus.DoesNotExist:
+        doc_status, created = UserDocumentStatus.objects.get_or_create(user=user)
+        return doc_status
+
 
 @router.post(
     "/upload-pdf",
-    response={200: UploadResponseSchema, 400: dict, 413: dict},
-    auth=JWTAuth(),
+    response={202: UploadResponseSchema, 400: dict, 413: dict, 503: dict},
+    auth=CachedJWTAuth(),
     summary="Upload PDF document",
-    description="Upload a PDF document to vector storage. Accepts base64 encoded PDF files only."
+    description="Upload a PDF document to vector storage. Accepts base64 encoded PDF files only. The document is processed in the background."
 )
 def upload_pdf(request, payload: PDFUploadSchema):
     """
     Upload PDF document.
     
-    Accepts a base64 encoded PDF file, extracts the text content,
-    and sends it to the webhook for processing.
+    Accepts a base64 encoded PDF file and validates it. Text extraction and
+    the webhook call happen in the background, so the request returns 202
+    as soon as the document has been queued.
     """
     user = request.auth
     
     try:
-        # Decode base64 PDF
+        # Validate it's a PDF by checking the magic number of the first
+        # base64 block before decoding the whole payload
         try:
-            pdf_data = base64.b64decode(payload.file_base64)
-        except Exception as e:
+            header = base64.b64decode(payload.file_base64[:PDF_HEADER_BASE64_LENGTH], validate=True)
+        except ValueError:
             raise HttpError(400, "Invalid base64 encoding")
         
-        # Validate it's a PDF by checking magic number
-        if not pdf_data.startswith(b'%PDF'):
+        if not header.startswith(b'%PDF'):
             raise HttpError(400, "File is not a valid PDF document")
         
-        # Extract text from PDF
+        # Decode base64 PDF
         try:
-            pdf_file = io.BytesIO(pdf_data)
-            pdf_reader = PdfReader(pdf_file)
-            
-            # Extract text from all pages
-            text_content = ""
-            for page in pdf_reader.pages:
-                text_content += page.extract_text() + "\n"
-            
-            if not text_content.strip():
-                raise HttpError(400, "PDF document appears to be empty or contains no extractable text")
-                
-        except Exception as e:
-            if isinstance(e, HttpError):
-                raise e
-            raise HttpError(400, f"Error reading PDF: {str(e)}")
+            pdf_data = base64.b64decode(payload.file_base64, validate=True)
+        except ValueError:
+            raise HttpError(400, "Invalid base64 encoding")
         
-        # Prepare webhook payload
-        webhook_data = {
-            "user": {
-                "id": user.id,
-                "username": user.username,
-                "email": user.email,
-                "first_name": user.first_name,
-                "last_name": user.last_name,
-            },
-            "document": {
-                "filename": payload.filename or "document.pdf",
-                "text_content": text_content,
-                "uploaded_at": datetime.now().isoformat(),
-            }
-        }
+        # One timestamp for the response, the webhook payload and the status
+        uploaded_at = timezone.now()
         
-        # Send to webhook
-        webhook_url = "https://n8n.project100x.run.place/webhook/upload_document"
+        # Extract text and send it to the webhook outside the request
         try:
-            response = requests.post(
-                webhook_url,
-                json=webhook_data,
-                headers={"Content-Type": "application/json"},
-                timeout=30
-            )
-            response.raise_for_status()
-        except requests.exceptions.RequestException as e:
-            print(f"Error while uploading document: {str(e)}")
-            raise HttpError(500, f"Error while uploading document")
-        
-        # Update user document status
-        doc_status, created = UserDocumentStatus.objects.get_or_create(user=user)
-        doc_status.has_uploaded_document = True
-        doc_status.last_upload_date = timezone.now()
-        doc_status.save()
+            enqueue_pdf_upload(user, pdf_data, payload.filename or "document.pdf", uploaded_at)
+        except UploadQueueFull:
+            logger.warning("Upload queue full, rejecting PDF upload for user %s", user.id)
+            raise HttpError(503, "Too many documents are being processed, please try again shortly")
         
-        return UploadResponseSchema(
-            message="PDF uploaded successfully",
+        return 202, UploadResponseSchema(
+            message="PDF upload queued for processing",
             success=True,
-            uploaded_at=timezone.now().isoformat()
+            uploaded_at=uploaded_at.isoformat()
         )
         
     except HttpError:
         raise
     except Exception as e:
-        print(f"[ERROR] Unexpected error during PDF upload for user {user.id}: {str(e)}")
+        logger.exception("Unexpected error during PDF upload for user %s", user.id)
         raise HttpError(500, f"Unexpected error: {str(e)}")
 
 
 @router.get(
     "/status",
     response=DocumentStatusSchema,
-    auth=JWTAuth(),
+    auth=CachedJWTAuth(),
     summary="Get document upload status",
     description="Check if the current user has uploaded a document"
 )
@@ -118,21 +99,25 @@ def get_document_status(request):
     """
     Get document upload status.
     
-    Returns whether the authenticated user has uploaded a document.
+    Returns whether the authenticated user has uploaded a document, and the
+    outcome of the most recent upload (processing, succeeded or failed).
     """
     user = request.auth
-    doc_status, created = UserDocumentStatus.objects.get_or_create(user=user)
+    doc_status = _get_document_status(user)
+    upload_status, upload_error = doc_status.current_upload_status()
     
     return DocumentStatusSchema(
         has_uploaded_document=doc_status.has_uploaded_document,
-        last_upload_date=doc_status.last_upload_date.isoformat() if doc_status.last_upload_date else None
+        last_upload_date=doc_status.last_upload_date.isoformat() if doc_status.last_upload_date else None,
+        upload_status=upload_status,
+        upload_error=upload_error,
     )
 
 
 @router.delete(
     "/delete-data",
     response={200: DeleteDataResponseSchema, 500: dict},
-    auth=JWTAuth(),
+    auth=CachedJWTAuth(),
     summary="Delete user data",
     description="Delete user's document data from vector storage"
 )
@@ -152,24 +137,25 @@ def delete_user_data(request):
         }
         
         # Send to webhook
-        webhook_url = "https://n8n.project100x.run.place/webhook/delete_user_data"
         try:
-            response = requests.delete(
-                webhook_url,
+            response = webhook_session.delete(
+                DELETE_WEBHOOK_URL,
                 json=webhook_data,
-                headers={"Content-Type": "application/json"},
                 timeout=30
             )
             response.raise_for_status()
         except requests.exceptions.RequestException as e:
-            print(f"Error while deleting user data: {str(e)}")
+            logger.error("Error while deleting user data for user %s: %s", user.id, e)
             raise HttpError(500, f"Error while deleting user data")
         
         # Update user document status - reset the flags
-        doc_status, created = UserDocumentStatus.objects.get_or_create(user=user)
-        doc_status.has_uploaded_document = False
-        doc_status.last_upload_date = None
-        doc_status.save()
+        UserDocumentStatus.set_status(
+            user.id,
+            has_uploaded_document=False,
+            last_upload_date=None,
+            upload_status=None,
+            upload_error=None,
+        )
         
         return DeleteDataResponseSchema(
             message="User data deleted successfully",
@@ -3,10 +3,18 @@ from typing import Optional
 from pydantic import Field
 
 
+# Base64 length of a ~5 MB PDF; longer payloads are rejected before decoding
+MAX_PDF_BASE64_LENGTH = 7_500_000
+
+
 class PDFUploadSchema(Schema):
     """Schema for PDF document upload."""
     
-    file_base64: str = Field(..., description="Base64 encoded PDF file")
+    file_base64: str = Field(
+        ...,
+        max_length=MAX_PDF_BASE64_LENGTH,
+        description="Base64 encoded PDF file (max 5MB decoded)"
+    )
     filename: Optional[str] = Field(None, description="Optional filename")
 
 
@@ -23,6 +31,11 @@ class DocumentStatusSchema(Schema):
     
     has_uploaded_document: bool
     last_upload_date: Optional[str] = None
+    upload_status: Optional[str] = Field(
+        None,
+        description="Outcome of the most recent upload: processing, succeeded or failed"
+    )
+    upload_error: Optional[str] = None
 
 
 class DeleteDataResponseSchema(Schema):
@@ -0,0 +1,197 @@
+"""
+Background processing for document uploads.
+
+PDF text extraction and the upload webhook call run on a small thread pool,
+so the request worker can respond as soon as the upload has been validated.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from django.db import close_old_connections, transaction
+import functools
+import logging
+import requests
+import threading
+
+from .models import UserDocumentStatus
+from .webhooks import UPLOAD_WEBHOOK_URL, webhook_session
+
+logger = logging.getLogger(__name__)
+
+# Bounded so a burst of uploads cannot spawn an unbounded number of threads
+executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="documents")
+
+# Uploads queued or being processed per process; each holds up to 5 MB of PDF
+MAX_PENDING_UPLOADS = 16
+_upload_slots = threading.BoundedSemaphore(MAX_PENDING_UPLOADS)
+
+
+class UploadQueueFull(Exception):
+    """Raised when MAX_PENDING_UPLOADS uploads are already waiting for processing."""
+
+# Upper bound for extracted text; a CV never gets close to this
+MAX_TEXT_LENGTH = 500_000
+
+
+def extract_pdf_text(pdf_data: bytes) -> str:
+    """
+    Extract the text of a PDF page by page.
+
+    Extraction stops once MAX_TEXT_LENGTH characters have been collected,
+    so oversized or adversarial documents cannot exhaust memory.
+
+    Args:
+        pdf_data: Raw PDF bytes
+
+    Returns:
+        str: Text content, pages separated by newlines
+    """
+    # Imported here so web workers only load the PDF engine once it is needed
+    import pypdfium2
+
+    pdf = pypdfium2.PdfDocument(pdf_data)
+    try:
+        pages_text = []
+        text_length = 0
+        for page in pdf:
+            textpage = page.get_textpage()
+            page_text = textpage.get_text_range()
+            textpage.close()
+            page.close()
+
+            pages_text.append(page_text)
+            text_length += len(page_text)
+            if text_length >= MAX_TEXT_LENGTH:
+                logger.warning("PDF text exceeds %s characters, truncating", MAX_TEXT_LENGTH)
+                break
+
+        return "\n".join(pages_text)[:MAX_TEXT_LENGTH]
+    finally:
+        pdf.close()
+
+
+def _close_old_connections(func):
+    """Drop stale database connections around work run outside the request cycle."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        close_old_connections()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+    return wrapper
+
+
+def _record_failure(user_id, error):
+    """Mark the user's latest upload as failed so the status endpoint reports it."""
+    try:
+        UserDocumentStatus.set_status(
+            user_id,
+            upload_status=UserDocumentStatus.UploadStatus.FAILED,
+            upload_error=error,
+        )
+    except Exception:
+        logger.exception("Error recording failed upload for user %s", user_id)
+
+
+@_close_old_connections
+def process_pdf_upload(user_data: dict, pdf_data: bytes, filename: str, uploaded_at):
+    """
+    Extract text from an uploaded PDF and send it to the upload webhook.
+
+    Marks the user's document as uploaded once the webhook accepted it.
+    Failures are logged and recorded as the upload's status; an earlier
+    successful upload stays marked as uploaded.
+    """
+    try:
+        _process_pdf_upload(user_data, pdf_data, filename, uploaded_at)
+    finally:
+        _upload_slots.release()
+
+
+def _process_pdf_upload(user_data: dict, pdf_data: bytes, filename: str, uploaded_at):
+    """Process one upload; see process_pdf_upload."""
+    user_id = user_data["id"]
+
+    try:
+        text_content = extract_pdf_text(pdf_data)
+    except Exception as e:
+        logger.error("Error reading PDF for user %s: %s", user_id, e)
+        _record_failure(user_id, "The PDF could not be read")
+        return
+
+    if not text_content.strip():
+        logger.warning("PDF uploaded by user %s contains no extractable text", user_id)
+        _record_failure(user_id, "The PDF contains no extractable text")
+        return
+
+    webhook_data = {
+        "user": user_data,
+        "document": {
+            "filename": filename,
+            "text_content": text_content,
+            "uploaded_at": uploaded_at.isoformat(),
+        }
+    }
+
+    try:
+        response = webhook_session.post(
+            UPLOAD_WEBHOOK_URL,
+            json=webhook_data,
+            timeout=30
+        )
+        response.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        logger.error("Error while uploading document for user %s: %s", user_id, e)
+        _record_failure(user_id, "The document could not be stored, please try again later")
+        return
+
+    try:
+        UserDocumentStatus.set_status(
+            user_id,
+            has_uploaded_document=True,
+            last_upload_date=uploaded_at,
+            upload_status=UserDocumentStatus.UploadStatus.SUCCEEDED,
+            upload_error=None,
+        )
+    except Exception:
+        logger.exception("Error updating document status for user %s", user_id)
+        return
+
+    logger.info("Processed PDF upload for user %s", user_id)
+
+
+def enqueue_pdf_upload(user, pdf_data: bytes, filename: str, uploaded_at):
+    """
+    Schedule background processing of an uploaded PDF.
+
+    The work is submitted once the surrounding transaction commits, and
+    the upload is marked as processing until it completes. Queued work only
+    lives in this process; the status endpoint reports uploads lost to a
+    restart as failed once UserDocumentStatus.PROCESSING_TIMEOUT has passed.
+    `uploaded_at` is the aware timestamp already returned to the client.
+
+    Raises:
+        UploadQueueFull: MAX_PENDING_UPLOADS uploads are already pending
+    """
+    if not _upload_slots.acquire(blocking=False):
+        raise UploadQueueFull()
+
+    user_data = {
+        "id": user.id,
+        "username": user.username,
+        "email": user.email,
+        "first_name": user.first_name,
+        "last_name": user.last_name,
+    }
+    try:
+        UserDocumentStatus.set_status(
+            user.id,
+            upload_status=UserDocumentStatus.UploadStatus.PROCESSING,
+            upload_error=None,
+        )
+    except Exception:
+        _upload_slots.release()
+        raise
+
+    transaction.on_commit(
+        lambda: executor.submit(process_pdf_upload, user_data, pdf_data, filename, uploaded_at)
+    )
@@ -1,3 +1,149 @@
+import base64
+import threading
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from django.utils import timezone
+from ninja_jwt.tokens import RefreshToken
+
+from .models import UserDocumentStatus
+from .schemas import MAX_PDF_BASE64_LENGTH
+
+User = get_user_model()
+
+
+class _ImmediateExecutor:
+    """Executor stand-in that runs submitted work synchronously"""
+
+    def submit(self, fn, *args, **kwargs):
+        # Skip the connection cleanup wrapper, it would close the test transaction
+        fn = getattr(fn, "__wrapped__", fn)
+        return fn(*args, **kwargs)
+
+
+class UploadPdfTest(TestCase):
+    """Test cases for the PDF upload endpoint"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.user = User.objects.create_user(username="uploader", password="Sup3r-secret-pass")
+        access = RefreshToken.for_user(self.user).access_token
+        self.auth_header = {"HTTP_AUTHORIZATION": f"Bearer {access}"}
+
+    def _upload(self, pdf_data):
+        return self.client.post(
+            "/api/documents/upload-pdf",
+            data={"file_base64": base64.b64encode(pdf_data).decode(), "filename": "cv.pdf"},
+            content_type="application/json",
+            **self.auth_header,
+        )
+
+    def test_rejects_non_pdf(self):
+        """Test uploads without the PDF magic number are rejected"""
+        response = self._upload(b"not a pdf")
+        self.assertEqual(response.status_code, 400)
+
+    def test_rejects_invalid_base64(self):
+        """Test payloads with characters outside the base64 alphabet are rejected"""
+        response = self.client.post(
+            "/api/documents/upload-pdf",
+            data={"file_base64": "JVBERi0xLjQg!!!!"},
+            content_type="application/json",
+            **self.auth_header,
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_rejects_oversized_payload(self):
+        """Test payloads above the schema limit are rejected before decoding"""
+        response = self.client.post(
+            "/api/documents/upload-pdf",
+            data={"file_base64": "A" * (MAX_PDF_BASE64_LENGTH + 4)},
+            content_type="application/json",
+            **self.auth_header,
+        )
+        self.assertEqual(response.status_code, 422)
+
+    @mock.patch("documents.tasks.executor", _ImmediateExecutor())
+    @mock.patch("documents.tasks.extract_pdf_text", return_value="Curriculum vitae")
+    @mock.patch("documents.tasks.webhook_session.post")
+    def test_upload_processed_after_commit(self, mock_post, mock_extract):
+        """Test the upload is queued and marks the document as uploaded"""
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self._upload(b"%PDF-1.4 minimal")
+
+        self.assertEqual(response.status_code, 202)
+        mock_extract.assert_called_once_with(b"%PDF-1.4 minimal")
+        self.assertEqual(mock_post.call_args.kwargs["json"]["document"]["filename"], "cv.pdf")
+        status = UserDocumentStatus.objects.get(user=self.user)
+        self.assertTrue(status.has_uploaded_document)
+        self.assertEqual(status.last_upload_date.isoformat(), response.json()["uploaded_at"])
+        self.assertEqual(
+            mock_post.call_args.kwargs["json"]["document"]["uploaded_at"],
+            response.json()["uploaded_at"],
+        )
+        self.assertEqual(status.upload_status, UserDocumentStatus.UploadStatus.SUCCEEDED)
+
+    @mock.patch("documents.tasks.executor", _ImmediateExecutor())
+    @mock.patch("documents.tasks.extract_pdf_text", return_value="   ")
+    @mock.patch("documents.tasks.webhook_session.post")
+    def test_failed_processing_reported_by_status(self, mock_post, mock_extract):
+        """Test a failure after the 202 is reported even when an earlier upload succeeded"""
+        UserDocumentStatus.objects.create(user=self.user, has_uploaded_document=True)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self._upload(b"%PDF-1.4 minimal")
+
+        self.assertEqual(response.status_code, 202)
+        mock_post.assert_not_called()
+        status = self.client.get("/api/documents/status", **self.auth_header).json()
+        self.assertTrue(status["has_uploaded_document"])
+        self.assertEqual(status["upload_status"], "failed")
+        self.assertEqual(status["upload_error"], "The PDF contains no extractable text")
+
+    def test_stale_processing_reported_as_failed(self):
+        """Test an upload lost to a restart is eventually reported as failed"""
+        UserDocumentStatus.objects.create(user=self.user, upload_status=UserDocumentStatus.UploadStatus.PROCESSING)
+        UserDocumentStatus.objects.filter(user=self.user).update(
+            updated_at=timezone.now() - UserDocumentStatus.PROCESSING_TIMEOUT - timedelta(seconds=1)
+        )
+
+        status = self.client.get("/api/documents/status", **self.auth_header).json()
+
+        self.assertEqual(status["upload_status"], "failed")
+
+    @mock.patch("documents.tasks._upload_slots", threading.BoundedSemaphore(1))
+    def test_rejects_upload_when_queue_full(self):
+        """Test uploads are rejected with 503 while the queue is full"""
+        with mock.patch("documents.tasks.executor") as mock_executor:
+            with self.captureOnCommitCallbacks(execute=True):
+                first = self._upload(b"%PDF-1.4 minimal")
+            second = self._upload(b"%PDF-1.4 minimal")
+
+        self.assertEqual(first.status_code, 202)
+        mock_executor.submit.assert_called_once()
+        self.assertEqual(second.status_code, 503)
+
+
+class DeleteUserDataTest(TestCase):
+    """Test cases for the delete data endpoint"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.user = User.objects.create_user(username="deleter", password="Sup3r-secret-pass")
+        access = RefreshToken.for_user(self.user).access_token
+        self.auth_header = {"HTTP_AUTHORIZATION": f"Bearer {access}"}
+
+    @mock.patch("documents.routers.webhook_session.delete")
+    def test_delete_resets_status(self, mock_delete):
+        """Test deleting data clears the upload flags"""
+        UserDocumentStatus.objects.create(user=self.user, has_uploaded_document=True)
+
+        response = self.client.delete("/api/documents/delete-data", **self.auth_header)
 
-# Create your tests here.
+        self.assertEqual(response.status_code, 200)
+        mock_delete.assert_called_once()
+        status = UserDocumentStatus.objects.get(user=self.user)
+        self.assertFalse(status.has_uploaded_document)
+        self.assertIsNone(status.last_upload_date)
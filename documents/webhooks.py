@@ -0,0 +1,23 @@
+"""
+HTTP client for the n8n document webhooks.
+
+A single session is shared by all requests in the process, so connections
+(and TLS sessions) to the webhook host are pooled and reused.
+"""
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+UPLOAD_WEBHOOK_URL = "https://n8n.project100x.run.place/webhook/upload_document"
+DELETE_WEBHOOK_URL = "https://n8n.project100x.run.place/webhook/delete_user_data"
+
+webhook_session = requests.Session()
+webhook_session.headers.update({"Content-Type": "application/json"})
+webhook_session.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=20,
+        max_retries=Retry(total=2, backoff_factor=0.2),
+    ),
+)
@@ -1,6 +1,16 @@
 from django.contrib import admin
-from .models import JobListing, JobSearch, JobApplication, SearchProfile, SearchProfile
+from django.contrib.auth import get_user_model
+from django.contrib.postgres.search import SearchQuery
+from django.db.models import Q
+from .models import (
+    JOB_LISTING_SEARCH_VECTOR,
+    JobListing,
+    JobSearch,
+    JobApplication,
+    SearchProfile,
+)
 
+User = get_user_model()
 
 @admin.register(JobListing)
 class JobListingAdmin(admin.ModelAdmin):
@@ -24,14 +34,19 @@ class JobListingAdmin(admin.ModelAdmin):
         'posted_date',
     ]
     
+    # Substring matches on these are served by the trigram indexes from
+    # migrations 0013 and 0020; every arm of the OR needs an index, or
+    # PostgreSQL falls back to a sequential scan. description is only
+    # matched through the full-text index, see get_search_results
     search_fields = [
         'job_id',
         'title',
         'company_name',
         'location',
-        'description',
     ]
     
+    search_help_text = "Partial match on job ID, title, company or location, or full-text search including the description"
+    
     readonly_fields = [
         'job_id',
         'created_at',
@@ -67,6 +82,23 @@ class JobListingAdmin(admin.ModelAdmin):
     )
     
     ordering = ['-created_at']
+    
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Search listings by substring or full-text match.
+        
+        The default substring lookup keeps partial terms (and the autocomplete
+        widget on JobApplication) working; the full-text match on the GIN
+        index adds hits from the description and stemmed word forms.
+        """
+        search_term = search_term.strip()
+        if not search_term:
+            return super().get_search_results(request, queryset, search_term)
+        
+        queryset = queryset.alias(search=JOB_LISTING_SEARCH_VECTOR)
+        substring_matches, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        search_query = SearchQuery(search_term, config='english', search_type='websearch')
+        return substring_matches | queryset.filter(search=search_query), may_have_duplicates
 
 
 @admin.register(JobSearch)
@@ -142,15 +174,16 @@ class JobApplicationAdmin(admin.ModelAdmin):
         'updated_at',
     ]
     
+    # Only columns with a trigram index (migration 0013): one unindexed arm in
+    # the OR would force a sequential scan. Users are matched separately, see
+    # get_search_results
     search_fields = [
-        'user__username',
-        'user__email',
         'job_title',
         'company_name',
-        'job_location',
-        'notes',
     ]
     
+    search_help_text = "Partial match on job title or company, or an exact username or email"
+    
     readonly_fields = [
         'applied_at',
         'updated_at',
@@ -186,7 +219,31 @@ class JobApplicationAdmin(admin.ModelAdmin):
     
     ordering = ['-applied_at']
     
-    raw_id_fields = ['user', 'job_listing']
+    # Searchable widgets instead of rendering every user / listing as an option
+    autocomplete_fields = ['user', 'job_listing']
+    
+    list_select_related = ('user', 'job_listing')
+    
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Search applications by job title or company, or by applicant.
+        
+        Applicants are resolved to user IDs first, with an exact username or
+        email match, so the application query stays a single-table OR whose
+        arms are all index-backed (user_id leads jobapp_user_appliedat_idx).
+        """
+        search_term = search_term.strip()
+        matches, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        if not search_term:
+            return matches, may_have_duplicates
+        
+        user_ids = list(
+            User.objects.filter(Q(username=search_term) | Q(email__iexact=search_term))
+            .values_list('id', flat=True)
+        )
+        if user_ids:
+            matches = matches | queryset.filter(user_id__in=user_ids)
+        return matches, may_have_duplicates
 
 
 @admin.register(SearchProfile)
@@ -250,4 +307,6 @@ class SearchProfileAdmin(admin.ModelAdmin):
     
     ordering = ['-created_at']
     
-    raw_id_fields = ['user']
+    autocomplete_fields = ['user']
+    
+    list_select_related = ('user',)
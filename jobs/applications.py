@@ -4,8 +4,9 @@ from ninja.errors import HttpError
 from typing import List
 from django.contrib.auth import get_user_model
 from django.utils import timezone
-from datetime import timedelta, date
-from django.db.models import Count
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime, timedelta, date
+from django.db.models import Count, F, OuterRef, Q, Subquery
 from django.db.models.functions import TruncDate
 
 from .models import JobApplication, JobListing
@@ -25,6 +26,37 @@ User = get_user_model()
 router = Router(tags=["applications"])
 
 
+MAX_APPLICATIONS_PAGE_SIZE = 100
+
+
+def _encode_cursor(application):
+    """Encode the position of an application row as an opaque, URL-safe pagination cursor."""
+    position = f"{application['applied_at'].isoformat()}|{application['id']}"
+    return urlsafe_b64encode(position.encode()).decode()
+
+
+def _decode_cursor(cursor):
+    """Decode a pagination cursor into (applied_at, id). Raises ValueError if malformed."""
+    applied_at, application_id = urlsafe_b64decode(cursor.encode()).decode().split('|')
+    return datetime.fromisoformat(applied_at), int(application_id)
+
+
+def _application_values(queryset):
+    """Select only the columns JobApplicationSchema needs, with the linked job_id."""
+    return queryset.values(
+        'id',
+        'job_title',
+        'company_name',
+        'job_location',
+        'job_url',
+        'notes',
+        'status',
+        'applied_at',
+        'updated_at',
+        job_id=F('job_listing__job_id'),
+    )
+
+
 @router.post(
     "/",
     response={201: CreateJobApplicationResponse, 400: ErrorResponse, 404: ErrorResponse},
@@ -47,69 +79,79 @@ def create_job_application(request, payload: CreateJobApplicationRequest):
     # Get authenticated user from JWT token
     user = request.user
     
-    # Validate that job_id exists if provided
-    job_listing = None
+    # Validate that job_id exists if provided, fetching the listing's primary key
+    # and the user's existing application date for it in the same query
+    job_listing_id = None
     if payload.job_id:
-        try:
-            job_listing = JobListing.objects.get(job_id=payload.job_id)
-        except JobListing.DoesNotExist:
+        existing_applied_at = JobApplication.objects.filter(
+            user=user,
+            job_listing=OuterRef('pk')
+        ).values('applied_at')[:1]
+        job_listing = JobListing.objects.filter(
+            job_id=payload.job_id
+        ).values_list(
+            'id', Subquery(existing_applied_at)
+        ).first()
+        
+        if job_listing is None:
             return 404, ErrorResponse(
                 success=False,
                 error="Job not found",
                 details=f"Job with ID {payload.job_id} not found in database"
             )
+        
+        job_listing_id, existing_applied_at = job_listing
     
     # Check for duplicate applications
-    if job_listing:
+    if job_listing_id:
         # Check if user has already applied to this job listing
-        existing_application = JobApplication.objects.filter(
-            user=user,
-            job_listing=job_listing
-        ).first()
-        
-        if existing_application:
+        if existing_applied_at:
             return 400, ErrorResponse(
                 success=False,
                 error="Duplicate application",
-                details=f"You have already applied to this job on {existing_application.applied_at.strftime('%Y-%m-%d at %H:%M')}"
+                details=f"You have already applied to this job on {existing_applied_at.strftime('%Y-%m-%d at %H:%M')}"
             )
     else:
-        # For custom applications (no job_listing), check for duplicates
-        # First check by job_url if provided (most reliable)
+        # For custom applications (no job_listing), check for duplicates by
+        # job_url (most reliable) or job_title + company_name in one query
+        duplicate_q = Q(job_title=payload.job_title, company_name=payload.company_name)
         if payload.job_url:
-            existing_application = JobApplication.objects.filter(
-                user=user,
-                job_listing__isnull=True,
-                job_url=payload.job_url
-            ).first()
-            
-            if existing_application:
-                return 400, ErrorResponse(
-                    success=False,
-                    error="Duplicate application",
-                    details=f"You have already applied to this job on {existing_application.applied_at.strftime('%Y-%m-%d at %H:%M')}"
-                )
+            duplicate_q |= Q(job_url=payload.job_url)
         
-        # Also check for same job_title + company_name (fallback for applications without URL)
-        existing_application = JobApplication.objects.filter(
+        duplicates = JobApplication.objects.filter(
+            duplicate_q,
             user=user,
             job_listing__isnull=True,
-            job_title=payload.job_title,
-            company_name=payload.company_name
-        ).first()
+        ).values('job_url', 'applied_at')
+        
+        # A job_url match takes precedence over a title + company match
+        url_match = None
+        title_match = None
+        for duplicate in duplicates:
+            if payload.job_url and duplicate['job_url'] == payload.job_url:
+                url_match = duplicate
+                break
+            title_match = title_match or duplicate
         
-        if existing_application:
+        if url_match:
             return 400, ErrorResponse(
                 success=False,
                 error="Duplicate application",
-                details=f"You have already applied to {payload.job_title} at {payload.company_name} on {existing_application.applied_at.strftime('%Y-%m-%d at %H:%M')}"
+                details=f"You have already applied to this job on {url_match['applied_at'].strftime('%Y-%m-%d at %H:%M')}"
+            )
+        
+        if title_match:
+            return 400, ErrorResponse(
+                success=False,
+                error="Duplicate application",
+                details=f"You have already applied to {payload.job_title} at {payload.company_name} on {title_match['applied_at'].strftime('%Y-%m-%d at %H:%M')}"
             )
     
     # Create the job application
     try:
         application = JobApplication.objects.create(
             user=user,
-            job_listing=job_listing,
+            job_listing_id=job_listing_id,
             job_title=payload.job_title,
             company_name=payload.company_name,
             job_location=payload.job_location,
@@ -120,7 +162,7 @@ def create_job_application(request, payload: CreateJobApplicationRequest):
         # Build response schema
         application_schema = JobApplicationSchema(
             id=application.id,
-            job_id=job_listing.job_id if job_listing else None,
+            job_id=payload.job_id if job_listing_id else None,
             job_title=application.job_title,
             company_name=application.company_name,
             job_location=application.job_location,
@@ -146,43 +188,58 @@ def create_job_application(request, payload: CreateJobApplicationRequest):
 
 @router.get(
     "/",
-    response=JobApplicationListResponse,
+    response={200: JobApplicationListResponse, 400: ErrorResponse},
     auth=JWTAuth(),
-    summary="List all job applications",
-    description="Get all job applications for the authenticated user, ordered by most recent first. Requires authentication."
+    summary="List job applications",
+    description="Get the authenticated user's job applications, most recent first, one page at a time. Pass the returned next_cursor as cursor to fetch the next page. Requires authentication."
 )
-def list_job_applications(request):
+def list_job_applications(request, limit: int = 50, cursor: str = None):
     """
-    List all job applications for the authenticated user.
+    List job applications for the authenticated user.
+    
+    Returns applications ordered by applied_at (most recent first) using keyset
+    pagination on (applied_at, id), so every page is an index range scan no
+    matter how deep the user pages.
+    
+    Args:
+        limit: Maximum number of results (default: 50, max: 100)
+        cursor: next_cursor from the previous page (optional)
     
-    Returns all applications ordered by applied_at (most recent first).
     Requires a valid JWT token in the Authorization header.
     """
     # Get authenticated user from JWT token
     user = request.user
+    limit = max(1, min(limit, MAX_APPLICATIONS_PAGE_SIZE))
     
-    # Get all applications for this user
-    applications = JobApplication.objects.filter(user=user).select_related('job_listing')
+    applications = JobApplication.objects.filter(user=user).order_by('-applied_at', '-id')
+    
+    # Continue after the last application of the previous page
+    if cursor:
+        try:
+            cursor_applied_at, cursor_id = _decode_cursor(cursor)
+        except ValueError:
+            return 400, ErrorResponse(
+                success=False,
+                error="Invalid cursor",
+                details="The cursor must be a next_cursor value returned by this endpoint"
+            )
+        applications = applications.filter(
+            Q(applied_at__lt=cursor_applied_at) |
+            Q(applied_at=cursor_applied_at, id__lt=cursor_id)
+        )
+    
+    # Fetch one extra row to know whether another page exists
+    rows = list(_application_values(applications)[:limit + 1])
+    has_more = len(rows) > limit
+    rows = rows[:limit]
     
     # Convert to schema
-    application_schemas = []
-    for application in applications:
-        application_schemas.append(JobApplicationSchema(
-            id=application.id,
-            job_id=application.job_listing.job_id if application.job_listing else None,
-            job_title=application.job_title,
-            company_name=application.company_name,
-            job_location=application.job_location,
-            job_url=application.job_url,
-            notes=application.notes,
-            status=application.status,
-            applied_at=application.applied_at,
-            updated_at=application.updated_at,
-        ))
+    application_schemas = [JobApplicationSchema(**application) for application in rows]
     
-    return JobApplicationListResponse(
+    return 200, JobApplicationListResponse(
         applications=application_schemas,
-        count=len(application_schemas)
+        count=len(application_schemas),
+        next_cursor=_encode_cursor(rows[-1]) if has_more else None
     )
 
 
@@ -275,53 +332,9 @@ def get_application_stats(request):
     )
 
 
-@router.get(
-    "/{application_id}",
-    response={200: JobApplicationSchema, 404: ErrorResponse},
-    auth=JWTAuth(),
-    summary="Get a specific job application",
-    description="Get details of a specific job application by ID. Only returns applications belonging to the authenticated user. Requires authentication."
-)
-def get_job_application(request, application_id: int):
-    """
-    Get a specific job application by ID.
-    
-    Only returns applications that belong to the authenticated user.
-    Requires a valid JWT token in the Authorization header.
-    """
-    # Get authenticated user from JWT token
-    user = request.user
-    
-    try:
-        application = JobApplication.objects.select_related('job_listing').get(
-            id=application_id,
-            user=user  # Ensure user can only access their own applications
-        )
-        
-        return 200, JobApplicationSchema(
-            id=application.id,
-            job_id=application.job_listing.job_id if application.job_listing else None,
-            job_title=application.job_title,
-            company_name=application.company_name,
-            job_location=application.job_location,
-            job_url=application.job_url,
-            notes=application.notes,
-            status=application.status,
-            applied_at=application.applied_at,
-            updated_at=application.updated_at,
-        )
-        
-    except JobApplication.DoesNotExist:
-        return 404, ErrorResponse(
-            success=False,
-            error="Application not found",
-            details=f"Job application with ID {application_id} not found or you don't have permission to access it"
-        )
-
-
 @router.get(
     "/check",
-    response=CheckApplicationResponse,
+    response={200: CheckApplicationResponse, 400: ErrorResponse},
     auth=JWTAuth(),
     summary="Check if user has applied to a job",
     description="Check if the authenticated user has already applied to a specific job. Checks in priority order: job_id → job_url → job_title + company_name. If multiple parameters are provided, only the highest priority one is used. Returns true if applied, false otherwise. Requires authentication."
@@ -351,17 +364,21 @@ def check_job_application(
     
     has_applied = False
     
+    if not (job_id or job_url or (job_title and company_name)):
+        # No valid parameters provided
+        return 400, ErrorResponse(
+            success=False,
+            error="Invalid parameters",
+            details="At least one of the following must be provided: job_id, job_url, or (job_title + company_name)"
+        )
+    
     # Check by job_id (for job listings) - highest priority
+    # (a missing job listing simply yields no match)
     if job_id:
-        try:
-            job_listing = JobListing.objects.get(job_id=job_id)
-            has_applied = JobApplication.objects.filter(
-                user=user,
-                job_listing=job_listing
-            ).exists()
-        except JobListing.DoesNotExist:
-            # Job listing doesn't exist, so user hasn't applied
-            has_applied = False
+        has_applied = JobApplication.objects.filter(
+            user=user,
+            job_listing__job_id=job_id
+        ).exists()
     
     # Check by job_url (for custom applications)
     elif job_url:
@@ -372,7 +389,7 @@ def check_job_application(
         ).exists()
     
     # Check by job_title + company_name (for custom applications)
-    elif job_title and company_name:
+    else:
         has_applied = JobApplication.objects.filter(
             user=user,
             job_listing__isnull=True,
@@ -380,15 +397,41 @@ def check_job_application(
             company_name=company_name
         ).exists()
     
-    else:
-        # No valid parameters provided
-        return 400, ErrorResponse(
+    return CheckApplicationResponse(has_applied=has_applied)
+
+
+@router.get(
+    "/{application_id}",
+    response={200: JobApplicationSchema, 404: ErrorResponse},
+    auth=JWTAuth(),
+    summary="Get a specific job application",
+    description="Get details of a specific job application by ID. Only returns applications belonging to the authenticated user. Requires authentication."
+)
+def get_job_application(request, application_id: int):
+    """
+    Get a specific job application by ID.
+    
+    Only returns applications that belong to the authenticated user.
+    Requires a valid JWT token in the Authorization header.
+    """
+    # Get authenticated user from JWT token
+    user = request.user
+    
+    application = _application_values(
+        JobApplication.objects.filter(
+            id=application_id,
+            user=user  # Ensure user can only access their own applications
+        )
+    ).first()
+    
+    if application is None:
+        return 404, ErrorResponse(
             success=False,
-            error="Invalid parameters",
-            details="At least one of the following must be provided: job_id, job_url, or (job_title + company_name)"
+            error="Application not found",
+            details=f"Job application with ID {application_id} not found or you don't have permission to access it"
         )
     
-    return CheckApplicationResponse(has_applied=has_applied)
+    return 200, JobApplicationSchema(**application)
 
 
 @router.patch(
@@ -420,7 +463,7 @@ def update_application_status(request, application_id: int, payload: UpdateAppli
         
         # Update the status
         application.status = payload.status
-        application.save()
+        application.save(update_fields=['status', 'updated_at'])
         
         # Build response schema
         application_schema = JobApplicationSchema(
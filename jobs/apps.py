@@ -10,10 +10,20 @@ class JobsConfig(AppConfig):
     verbose_name = 'Job Search'
     
     def ready(self):
-        """Start scheduled tasks when Django is ready"""
-        # Only start scheduler in production/development, not during migrations or tests
+        """
+        Optionally start scheduled tasks in-process when Django is ready.
+        
+        Scheduled tasks normally run in a dedicated process
+        (`python manage.py run_scheduler`), so web workers don't each start
+        their own scheduler. Set DJANGO_RUN_SCHEDULER=1 to start it here instead,
+        e.g. for a single-process development server.
+        """
+        import os
         import sys
-        if 'migrate' not in sys.argv and 'test' not in sys.argv:
+        if os.environ.get('DJANGO_RUN_SCHEDULER') != '1':
+            return
+        # Never start the scheduler during migrations or tests
+        if 'migrate' not in sys.argv and 'test' not in sys.argv and 'run_scheduler' not in sys.argv:
             try:
                 from jobs.scheduled_tasks import start_scheduler
                 start_scheduler()
@@ -12,15 +12,48 @@ Usage:
     
     # Verbose output
     python manage.py cleanup_unused_jobs --verbose
+    
+    # Delete in smaller batches
+    python manage.py cleanup_unused_jobs --batch-size 1000
 """
 
-from django.core.management.base import BaseCommand
-from django.db.models import Count, Q
-from jobs.models import JobListing, JobApplication
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Exists, OuterRef
+from jobs.models import JobListing, JobApplication, invalidate_job_listings
+import json
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Anti-join delete, limited per statement so each batch commits on its own.
+# Nothing else references job listings, so no ORM-side cascading is needed.
+DELETE_UNUSED_BATCH_SQL = """
+    DELETE FROM {listing_table}
+    WHERE id IN (
+        SELECT j.id FROM {listing_table} j
+        WHERE NOT EXISTS (
+            SELECT 1 FROM {application_table} a WHERE a.job_listing_id = j.id
+        )
+        LIMIT %s
+    )
+    RETURNING job_id
+""".format(
+    listing_table=JobListing._meta.db_table,
+    application_table=JobApplication._meta.db_table,
+)
+
+
+def estimated_count(queryset):
+    """
+    Return the planner's row estimate for a queryset.
+    
+    Reads the top-level "Plan Rows" from EXPLAIN instead of running COUNT(*),
+    so it returns immediately regardless of table size.
+    """
+    plan = json.loads(queryset.explain(format='json'))
+    return int(plan[0]['Plan']['Plan Rows'])
+
 
 class Command(BaseCommand):
     help = 'Delete job listings that have no applications'
@@ -36,42 +69,52 @@ class Command(BaseCommand):
             action='store_true',
             help='Show detailed output',
         )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=10000,
+            help='Number of job listings deleted per transaction (default: 10000)',
+        )
 
     def handle(self, *args, **options):
         dry_run = options['dry_run']
         verbose = options['verbose']
+        batch_size = options['batch_size']
+        
+        # LIMIT 0 deletes nothing, so the batch loop would never finish
+        if batch_size < 1:
+            raise CommandError('--batch-size must be a positive integer')
         
         self.stdout.write(self.style.SUCCESS('Starting cleanup of unused job listings...'))
         
         # Find all job listings that have no applications
-        # Using a subquery to find job_listing IDs that are referenced in JobApplication
-        job_listings_with_applications = JobApplication.objects.filter(
-            job_listing__isnull=False
-        ).values_list('job_listing_id', flat=True).distinct()
-        
-        # Get job listings that are NOT in the list of job listings with applications
-        unused_jobs = JobListing.objects.exclude(
-            id__in=job_listings_with_applications
+        # NOT EXISTS probes the job_listing_id index per listing instead of
+        # materializing the distinct set of referenced IDs
+        unused_jobs = JobListing.objects.filter(
+            ~Exists(JobApplication.objects.filter(job_listing_id=OuterRef('pk')))
         )
         
-        count = unused_jobs.count()
-        
-        if count == 0:
+        if not unused_jobs.exists():
             self.stdout.write(self.style.SUCCESS('No unused job listings found. Database is clean!'))
             return
         
+        # An estimate is enough for reporting; the deletion below returns the exact number
+        count = estimated_count(unused_jobs)
+        
         self.stdout.write(
-            self.style.WARNING(f'Found {count} job listing(s) with no applications')
+            self.style.WARNING(f'Found approximately {count} job listing(s) with no applications')
         )
         
         if verbose:
             self.stdout.write('\nJob listings to be deleted:')
-            for job in unused_jobs[:10]:  # Show first 10
+            for job in unused_jobs.only('job_id', 'title', 'company_name')[:10]:  # Show first 10
                 self.stdout.write(f'  - {job.job_id}: {job.title} at {job.company_name}')
             if count > 10:
-                self.stdout.write(f'  ... and {count - 10} more')
+                self.stdout.write(f'  ... and about {count - 10} more')
         
         if dry_run:
+            # A dry run is an explicit request for the exact number
+            count = unused_jobs.count()
             self.stdout.write(
                 self.style.WARNING(
                     f'\nDRY RUN: Would delete {count} job listing(s). '
@@ -79,8 +122,17 @@ class Command(BaseCommand):
                 )
             )
         else:
-            # Delete the unused job listings
-            deleted_count, _ = unused_jobs.delete()
+            # Delete the unused job listings in SQL, one statement per batch,
+            # to bound how long each transaction holds its locks
+            deleted_count = 0
+            with connection.cursor() as cursor:
+                while True:
+                    cursor.execute(DELETE_UNUSED_BATCH_SQL, [batch_size])
+                    # Raw SQL bypasses post_delete, so evict cached listings here
+                    invalidate_job_listings([row[0] for row in cursor.fetchall()])
+                    deleted_count += cursor.rowcount
+                    if cursor.rowcount < batch_size:
+                        break
             
             self.stdout.write(
                 self.style.SUCCESS(
@@ -0,0 +1,38 @@
+"""
+Django management command to run the scheduled tasks in a dedicated process.
+
+Web workers don't start the scheduler themselves, so exactly one scheduler runs
+no matter how many gunicorn workers are serving requests.
+
+Usage:
+    python manage.py run_scheduler
+"""
+
+from django.core.management.base import BaseCommand
+from jobs.scheduled_tasks import scheduler, start_scheduler
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Run the scheduled tasks (e.g. nightly cleanup) until interrupted'
+
+    def handle(self, *args, **options):
+        start_scheduler()
+        if not scheduler.running:
+            self.stderr.write(self.style.ERROR('Scheduler failed to start'))
+            return
+        
+        self.stdout.write(self.style.SUCCESS('Scheduler running. Press Ctrl+C to stop.'))
+        
+        try:
+            while True:
+                time.sleep(60)
+        except KeyboardInterrupt:
+            self.stdout.write('Stopping scheduler...')
+        finally:
+            if scheduler.running:
+                scheduler.shutdown()
+            logger.info("Scheduler stopped")
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0010_create_searchprofile'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(condition=models.Q(('job_listing__isnull', True)), fields=['user', 'job_url'], name='ja_user_url_custom_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(condition=models.Q(('job_listing__isnull', True)), fields=['user', 'job_title', 'company_name'], name='ja_user_title_co_idx'),
+        ),
+    ]
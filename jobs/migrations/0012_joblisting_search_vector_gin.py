@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:48
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0011_jobapplication_duplicate_check_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='joblisting',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.search.SearchVector('title', 'company_name', 'location', 'description', config='english'), name='joblisting_search_vector_gin'),
+        ),
+    ]
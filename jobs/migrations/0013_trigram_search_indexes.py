@@ -0,0 +1,44 @@
+# Generated manually - Trigram indexes for icontains lookups
+# Note: Django compiles `icontains` to UPPER("column"::text) LIKE UPPER(%s) on PostgreSQL,
+# so the indexes are built on UPPER(column) to be usable by those queries.
+# pg_trgm ships with PostgreSQL contrib; servers without it skip the indexes.
+
+from django.db import migrations
+
+
+TRIGRAM_INDEXES = [
+    ("joblisting_title_trgm", "jobs_joblisting", "title"),
+    ("joblisting_company_name_trgm", "jobs_joblisting", "company_name"),
+    ("joblisting_location_trgm", "jobs_joblisting", "location"),
+    ("jobapplication_job_title_trgm", "jobs_jobapplication", "job_title"),
+    ("jobapplication_company_name_trgm", "jobs_jobapplication", "company_name"),
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0012_joblisting_search_vector_gin'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+            DO $$
+            BEGIN
+                IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+                    CREATE EXTENSION IF NOT EXISTS pg_trgm;
+                    %s
+                END IF;
+            END
+            $$;
+            """ % "\n                    ".join(
+                f"CREATE INDEX IF NOT EXISTS {name} ON {table} USING gin (UPPER({column}) gin_trgm_ops);"
+                for name, table, column in TRIGRAM_INDEXES
+            ),
+            reverse_sql=[
+                f"DROP INDEX IF EXISTS {name};"
+                for name, table, column in TRIGRAM_INDEXES
+            ],
+        ),
+    ]
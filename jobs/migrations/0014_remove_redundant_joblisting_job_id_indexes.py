@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0013_trigram_search_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='joblisting',
+            name='jobs_joblis_job_id_db5b1a_idx',
+        ),
+        migrations.AlterField(
+            model_name='joblisting',
+            name='job_id',
+            field=models.CharField(max_length=255, unique=True),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:53
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0014_remove_redundant_joblisting_job_id_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='joblisting',
+            name='jobs_joblis_title_da092b_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='joblisting',
+            name='jobs_joblis_company_e94c9f_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='joblisting',
+            name='jobs_joblis_locatio_6129f1_idx',
+        ),
+    ]
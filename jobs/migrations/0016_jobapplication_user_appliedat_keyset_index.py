@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0015_remove_joblisting_btree_text_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['user', '-applied_at', '-id'], name='jobapp_user_appliedat_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='jobapplication',
+            name='jobs_jobapp_user_id_a69614_idx',
+        ),
+    ]
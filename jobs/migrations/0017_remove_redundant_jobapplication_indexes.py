@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:58
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0016_jobapplication_user_appliedat_keyset_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='jobapplication',
+            name='jobs_jobapp_status_8c3944_idx',
+        ),
+        migrations.AlterField(
+            model_name='jobapplication',
+            name='applied_at',
+            field=models.DateTimeField(auto_now_add=True),
+        ),
+        migrations.AlterField(
+            model_name='jobapplication',
+            name='user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='job_applications', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-15 23:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0017_remove_redundant_jobapplication_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['user', 'status'], name='ja_user_status_idx'),
+        ),
+    ]
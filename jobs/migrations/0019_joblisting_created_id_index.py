@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-15 23:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0018_jobapplication_user_status_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='joblisting',
+            index=models.Index(fields=['-created_at', '-id'], name='joblisting_created_id_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='joblisting',
+            name='jobs_joblis_created_f9b3ea_idx',
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated manually - Trigram index for substring search on job_id
+# The job listing admin ORs an icontains match on job_id with the other search
+# columns; without an index on every arm PostgreSQL cannot combine the trigram
+# and full-text indexes in a BitmapOr and scans the whole table instead.
+# Built on UPPER(job_id) like the indexes in 0013, and skipped the same way
+# on servers without pg_trgm.
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0019_joblisting_created_id_index'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+            DO $$
+            BEGIN
+                IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+                    CREATE EXTENSION IF NOT EXISTS pg_trgm;
+                    CREATE INDEX IF NOT EXISTS joblisting_job_id_trgm ON jobs_joblisting USING gin (UPPER(job_id) gin_trgm_ops);
+                END IF;
+            END
+            $$;
+            """,
+            reverse_sql="DROP INDEX IF EXISTS joblisting_job_id_trgm;",
+        ),
+    ]
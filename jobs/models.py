@@ -1,15 +1,61 @@
 from django.db import models
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from hashlib import sha1
+from uuid import uuid4
 
 User = get_user_model()
 
+# Listings and listing pages are only cached with settings.SHARED_CACHE: a
+# per-process cache would only be invalidated in the process that wrote, and
+# keep serving listings that e.g. the scheduler's cleanup deleted.
+
+# Detail reads of single listings
+JOB_LISTING_CACHE_TIMEOUT = 60
+
+# Listing pages change with every stored job, so they are only cached briefly
+JOB_LISTINGS_PAGE_CACHE_TIMEOUT = 60
+
+# Part of every cached listings page key; replacing it invalidates all pages at once
+JOB_LISTINGS_VERSION_KEY = "joblist:version"
+
+
+def job_listing_cache_key(job_id):
+    """Cache key for a single job listing"""
+    return f"jl:{job_id}"
+
+
+def job_listings_page_cache_key(**params):
+    """Cache key for one page of the listings endpoint, scoped to the current version"""
+    version = cache.get(JOB_LISTINGS_VERSION_KEY, "0")
+    lookup = "|".join(f"{name}={value}" for name, value in sorted(params.items()))
+    return f"joblist:{version}:{sha1(lookup.encode()).hexdigest()}"
+
+
+def invalidate_job_listings(job_ids):
+    """Drop cached copies of the given listings and every cached listings page."""
+    cache.delete_many([job_listing_cache_key(job_id) for job_id in job_ids])
+    cache.set(JOB_LISTINGS_VERSION_KEY, uuid4().hex, None)
+
+
+# Full-text document for job listings. Queries must use this exact expression
+# so PostgreSQL can match them against the functional GIN index below.
+JOB_LISTING_SEARCH_VECTOR = SearchVector(
+    'title', 'company_name', 'location', 'description', config='english'
+)
+
 
 class JobListing(models.Model):
     """Model to store job listings from LinkedIn"""
     
     # Job identifiers
-    job_id = models.CharField(max_length=255, unique=True, db_index=True)
+    job_id = models.CharField(max_length=255, unique=True)
     linkedin_url = models.URLField(max_length=500)
     
     # Basic job information
@@ -33,17 +79,60 @@ class JobListing(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        # title, company_name and location are only matched with icontains,
+        # which the trigram indexes from migration 0013 serve
         indexes = [
-            models.Index(fields=['job_id']),
-            models.Index(fields=['title']),
-            models.Index(fields=['company_name']),
-            models.Index(fields=['location']),
-            models.Index(fields=['-created_at']),
+            # Newest-first pages; id breaks ties so offset pagination is stable
+            models.Index(fields=['-created_at', '-id'], name='joblisting_created_id_idx'),
+            GinIndex(JOB_LISTING_SEARCH_VECTOR, name='joblisting_search_vector_gin'),
         ]
     
     def __str__(self):
         return f"{self.title} at {self.company_name}"
 
+    # Scraped columns refreshed when a listing with the same job_id already exists
+    UPSERT_FIELDS = [
+        'linkedin_url', 'title', 'company_name', 'location', 'description',
+        'employment_type', 'experience_level', 'posted_date', 'applicants_count',
+        'company_logo_url', 'updated_at',
+    ]
+
+    @classmethod
+    def bulk_upsert(cls, listings, batch_size=1000):
+        """
+        Insert or update job listings by job_id.
+
+        Issues one multi-row INSERT ... ON CONFLICT (job_id) DO UPDATE per
+        batch instead of a query (and transaction) per listing.
+        """
+        listings = cls.objects.bulk_create(
+            listings,
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=['job_id'],
+            update_fields=cls.UPSERT_FIELDS,
+        )
+        # bulk_create sends no post_save signals
+        invalidate_job_listings([listing.job_id for listing in listings])
+        return listings
+
+    @classmethod
+    def get_cached(cls, job_id):
+        """
+        Return the listing with the given job_id, reading through the cache.
+
+        Without a shared cache this is a plain database read.
+        Raises JobListing.DoesNotExist if there is no such listing.
+        """
+        if not settings.SHARED_CACHE:
+            return cls.objects.get(job_id=job_id)
+        key = job_listing_cache_key(job_id)
+        job = cache.get(key)
+        if job is None:
+            job = cls.objects.get(job_id=job_id)
+            cache.set(key, job, JOB_LISTING_CACHE_TIMEOUT)
+        return job
+
 
 class JobSearch(models.Model):
     """Model to store job search history and cache results"""
@@ -134,6 +223,20 @@ class SearchProfile(models.Model):
         return f"Profile{profile_name}: {self.keyword} in {self.location}"
 
 
+class JobApplicationManager(models.Manager):
+    """Manager that joins the user and job listing into every application query"""
+
+    def get_queryset(self):
+        # __str__ and the admin read both relations; joining them avoids N+1 queries.
+        # The listing description is never rendered with an application and is by
+        # far the widest column, so it is left out of the join.
+        return (
+            super().get_queryset()
+            .select_related('user', 'job_listing')
+            .defer('job_listing__description')
+        )
+
+
 class JobApplication(models.Model):
     """Model to track user job applications"""
     
@@ -147,12 +250,12 @@ class JobApplication(models.Model):
         THIRD_ROUND = "third_round", "Third Round"
         OFFER = "offer", "Offer"
     
-    # User who applied
+    # User who applied (indexed through jobapp_user_appliedat_idx)
     user = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
         related_name='job_applications',
-        db_index=True
+        db_index=False
     )
     
     # Link to job listing (nullable for custom applications)
@@ -182,16 +285,32 @@ class JobApplication(models.Model):
     )
     
     # Timestamps
-    applied_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    applied_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = JobApplicationManager()
+    
     class Meta:
         ordering = ['-applied_at']
         indexes = [
-            models.Index(fields=['user', '-applied_at']),
+            # Matches the list endpoint's keyset order, so pages are plain range scans
+            models.Index(fields=['user', '-applied_at', '-id'], name='jobapp_user_appliedat_idx'),
+            # Per-user status breakdown in the stats endpoint, answered index-only
+            models.Index(fields=['user', 'status'], name='ja_user_status_idx'),
             models.Index(fields=['-applied_at']),
             models.Index(fields=['company_name']),
-            models.Index(fields=['status']),
+            # Duplicate checks for custom applications (no job listing);
+            # (user, job_listing) lookups use the unique constraint below
+            models.Index(
+                fields=['user', 'job_url'],
+                condition=models.Q(job_listing__isnull=True),
+                name='ja_user_url_custom_idx'
+            ),
+            models.Index(
+                fields=['user', 'job_title', 'company_name'],
+                condition=models.Q(job_listing__isnull=True),
+                name='ja_user_title_co_idx'
+            ),
         ]
         constraints = [
             # Prevent duplicate applications for the same user and job listing
@@ -206,3 +325,10 @@ class JobApplication(models.Model):
     
     def __str__(self):
         return f"{self.user.username} applied to {self.job_title} at {self.company_name}"
+
+
+@receiver(post_save, sender=JobListing)
+@receiver(post_delete, sender=JobListing)
+def invalidate_job_listing_cache(sender, instance, **kwargs):
+    """Drop the cached copy of a listing when it is saved or deleted."""
+    invalidate_job_listings([instance.job_id])
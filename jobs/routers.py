@@ -1,7 +1,14 @@
 from ninja import Router
 from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, transaction
 from ninja_jwt.authentication import JWTAuth
+from operator import attrgetter
 import logging
+import re
+import threading
 import time
 
 from .schemas import (
@@ -18,11 +25,30 @@ from .schemas import (
     ExperienceLevelEnum,
 )
 from .services import LinkedInJobScraper
-from .models import JobListing, JobSearch, SearchProfile
+from .models import (
+    JOB_LISTINGS_PAGE_CACHE_TIMEOUT,
+    JobListing,
+    JobSearch,
+    SearchProfile,
+    job_listings_page_cache_key,
+)
 
 logger = logging.getLogger(__name__)
 router = Router(tags=["Jobs"])
 
+# Job ID at the end of a LinkedIn job URL path, with or without a title slug
+LINKEDIN_JOB_ID_RE = re.compile(r'/jobs/view/(?:[\w-]+?-)?(\d+)')
+
+# Upper bounds for list endpoints, so a large limit cannot load a whole table
+MAX_JOB_LISTINGS_PAGE_SIZE = 100
+MAX_SEARCH_HISTORY_SIZE = 100
+
+# Seconds between the starts of two LinkedIn job detail requests
+ENRICHMENT_INTERVAL = 2
+
+# Detail requests allowed in flight at once while enriching search results
+ENRICHMENT_WORKERS = 4
+
 
 def _convert_string_list_to_enums(string_list: List[str], enum_class) -> List:
     """Convert a list of strings to a list of enum values"""
@@ -38,6 +64,122 @@ def _convert_string_list_to_enums(string_list: List[str], enum_class) -> List:
     return result
 
 
+# One scraper per thread: requests sessions are not thread-safe, and keeping
+# them around lets later requests reuse pooled keep-alive connections
+_scrapers = threading.local()
+
+
+def _get_scraper():
+    """Return the calling thread's LinkedIn scraper, creating it on first use."""
+    scraper = getattr(_scrapers, 'scraper', None)
+    if scraper is None:
+        scraper = _scrapers.scraper = LinkedInJobScraper()
+    return scraper
+
+
+# Shared by all searches in the process, so its threads (and their scrapers) persist
+enrichment_executor = ThreadPoolExecutor(max_workers=ENRICHMENT_WORKERS, thread_name_prefix="enrich")
+
+
+# Start time reserved for the next LinkedIn job detail request in this process
+_linkedin_next_request = 0.0
+_linkedin_lock = threading.Lock()
+
+
+def _get_job_details(job_id):
+    """
+    Fetch LinkedIn job details, at most one request start per ENRICHMENT_INTERVAL.
+    
+    The interval is shared by every search and URL import in the process, so
+    concurrent requests cannot add up to a burst against LinkedIn.
+    """
+    global _linkedin_next_request
+    # Reserve a start slot under the lock, then wait for it outside of it
+    with _linkedin_lock:
+        now = time.monotonic()
+        start = max(now, _linkedin_next_request)
+        _linkedin_next_request = start + ENRICHMENT_INTERVAL
+    time.sleep(start - now)
+    return _get_scraper().get_job_details(job_id)
+
+
+def _fetch_job_details(job_ids):
+    """
+    Fetch LinkedIn job details for several jobs with overlapping requests.
+    
+    Requests still start ENRICHMENT_INTERVAL seconds apart (see
+    _get_job_details), so LinkedIn sees the same request rate as with
+    sequential fetching; only the time spent waiting for responses overlaps.
+    
+    Yields:
+        (job_id, future) pairs in input order; each future resolves to the
+        scraper's job details or raises its exception
+    """
+    futures = [enrichment_executor.submit(_get_job_details, job_id) for job_id in job_ids]
+    yield from zip(job_ids, futures)
+
+
+def _store_job_listings(listings):
+    """
+    Upsert enriched job listings in one batch, falling back to one row at a time.
+    
+    A single bad row (over-length field, NUL byte, constraint error) fails the
+    whole batch statement; retrying row by row stores the others and only
+    skips the offending listings.
+    
+    Returns:
+        job_ids of the listings that could not be stored
+    """
+    # psycopg2 rejects NUL bytes with ValueError before the query is sent
+    try:
+        with transaction.atomic():
+            JobListing.bulk_upsert(listings)
+        return []
+    except (DatabaseError, ValueError):
+        logger.warning(f"Bulk upsert of {len(listings)} job listings failed, storing them one by one", exc_info=True)
+    
+    failed = []
+    for listing in listings:
+        try:
+            with transaction.atomic():
+                JobListing.bulk_upsert([listing])
+        except (DatabaseError, ValueError) as e:
+            logger.error(f"✗ Failed to store job {listing.job_id}: {str(e)}")
+            failed.append(listing.job_id)
+    return failed
+
+
+# JobListing columns returned by JobListingSchema
+JOB_LISTING_FIELDS = (
+    'job_id',
+    'linkedin_url',
+    'title',
+    'company_name',
+    'location',
+    'description',
+    'employment_type',
+    'experience_level',
+    'posted_date',
+    'applicants_count',
+    'company_logo_url',
+)
+
+# Listing columns without the description, by far the widest one
+JOB_LISTING_SUMMARY_FIELDS = tuple(field for field in JOB_LISTING_FIELDS if field != 'description')
+
+_job_listing_attrs = attrgetter(*JOB_LISTING_FIELDS)
+
+
+def _job_listing_values(queryset, full=True):
+    """Select only the columns JobListingSchema needs, as dicts; full=False leaves out the description."""
+    return queryset.values(*(JOB_LISTING_FIELDS if full else JOB_LISTING_SUMMARY_FIELDS))
+
+
+def _job_listing_schema(job):
+    """Build the response schema for a JobListing instance."""
+    return JobListingSchema(**dict(zip(JOB_LISTING_FIELDS, _job_listing_attrs(job))))
+
+
 @router.post(
     "/search",
     response={200: JobSearchResponse, 400: ErrorResponse, 500: ErrorResponse},
@@ -77,7 +219,7 @@ def search_jobs(request, payload: ProfileSearchRequest):
         logger.info(f"Search parameters: limit={total_limit}, date_posted={date_posted}")
         logger.info(f"Found {len(profiles)} search profile(s) to process")
         
-        scraper = LinkedInJobScraper()
+        scraper = _get_scraper()
 
         # Evenly distribute the limit across profiles
         per_profile_base = total_limit // len(profiles)
@@ -201,17 +343,12 @@ def search_jobs(request, payload: ProfileSearchRequest):
         
         enriched_count = 0
         failed_count = 0
+        new_listings = []
         
-        for idx, job_id in enumerate(jobs_to_enrich):
+        for idx, (job_id, details_future) in enumerate(_fetch_job_details(jobs_to_enrich)):
             try:
-                # Rate limiting: wait 2 seconds between enrichment requests to avoid blocking
-                # Apply delay before each request (except the first one) to be respectful to LinkedIn
-                if idx > 0:
-                    logger.debug(f"Rate limiting: waiting 2 seconds before next enrichment...")
-                    time.sleep(2)
-                
                 logger.info(f"[{idx + 1}/{len(jobs_to_enrich)}] Enriching job {job_id}...")
-                job_details = scraper.get_job_details(job_id)
+                job_details = details_future.result()
                 
                 if not job_details:
                     logger.warning(f"[{idx + 1}/{len(jobs_to_enrich)}] ✗ Failed to enrich job {job_id}: No details returned")
@@ -224,8 +361,8 @@ def search_jobs(request, payload: ProfileSearchRequest):
                     failed_count += 1
                     continue
                 
-                # Create job listing in database
-                JobListing.objects.create(
+                # Collected and stored in one batch once enrichment is done
+                new_listings.append(JobListing(
                     job_id=job_id,
                     linkedin_url=job_details.get('linkedin_url', jobs_by_id[job_id]),
                     title=job_details.get('title', 'Unknown'),
@@ -237,11 +374,11 @@ def search_jobs(request, payload: ProfileSearchRequest):
                     posted_date=job_details.get('posted_date'),
                     applicants_count=job_details.get('applicants_count'),
                     company_logo_url=job_details.get('company_logo_url'),
-                )
+                ))
                 
                 enriched_count += 1
                 logger.info(
-                    f"[{idx + 1}/{len(jobs_to_enrich)}] ✓ Successfully enriched and stored job {job_id}: "
+                    f"[{idx + 1}/{len(jobs_to_enrich)}] ✓ Successfully enriched job {job_id}: "
                     f"'{job_details.get('title', 'Unknown')}' at {job_details.get('company_name', 'Unknown')}"
                 )
                 
@@ -251,6 +388,13 @@ def search_jobs(request, payload: ProfileSearchRequest):
                 # Continue with next job even if this one fails
                 continue
 
+        if new_listings:
+            # Upsert, so listings stored by a concurrent search do not fail the batch
+            store_failures = _store_job_listings(new_listings)
+            enriched_count -= len(store_failures)
+            failed_count += len(store_failures)
+            logger.info(f"Stored {len(new_listings) - len(store_failures)} enriched jobs in the database")
+
         logger.info("-" * 80)
         logger.info(
             f"Enrichment complete: {enriched_count} enriched, "
@@ -263,24 +407,11 @@ def search_jobs(request, payload: ProfileSearchRequest):
         logger.info("STEP 5: Querying database and preparing response")
         logger.info("-" * 80)
         
-        job_listings = JobListing.objects.filter(job_id__in=unique_job_ids).order_by('-created_at')
-        logger.info(f"Retrieved {job_listings.count()} job listings from database")
-        
-        job_schemas = []
-        for job in job_listings:
-            job_schemas.append(JobListingSchema(
-                job_id=job.job_id,
-                linkedin_url=job.linkedin_url,
-                title=job.title,
-                company_name=job.company_name,
-                location=job.location,
-                description=job.description,
-                employment_type=job.employment_type,
-                experience_level=job.experience_level,
-                posted_date=job.posted_date,
-                applicants_count=job.applicants_count,
-                company_logo_url=job.company_logo_url,
-            ))
+        job_listings = _job_listing_values(
+            JobListing.objects.filter(job_id__in=unique_job_ids).order_by('-created_at')
+        )
+        job_schemas = [JobListingSchema(**job) for job in job_listings]
+        logger.info(f"Retrieved {len(job_schemas)} job listings from database")
 
         logger.info("=" * 80)
         logger.info("JOB SEARCH COMPLETE")
@@ -325,7 +456,8 @@ def get_job_listings(
     keyword: str = None,
     location: str = None,
     limit: int = 25,
-    offset: int = 0
+    offset: int = 0,
+    full: bool = True
 ):
     """
     Get job listings from database
@@ -336,14 +468,30 @@ def get_job_listings(
     Args:
         keyword: Filter by job title keyword (optional)
         location: Filter by location (optional)
-        limit: Maximum number of results (default: 25)
+        limit: Maximum number of results (default: 25, at most 100)
         offset: Offset for pagination (default: 0)
+        full: Include the job description (default: true); pass false for
+            summary views to skip loading it
     
     Returns:
         List of job listings
     """
+    limit = max(1, min(limit, MAX_JOB_LISTINGS_PAGE_SIZE))
+    offset = max(0, offset)
+    
     try:
-        queryset = JobListing.objects.all()
+        # Pages are only cached where every worker sees the invalidation
+        cache_key = None
+        if settings.SHARED_CACHE:
+            cache_key = job_listings_page_cache_key(
+                keyword=keyword, location=location, limit=limit, offset=offset, full=full
+            )
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        # id breaks created_at ties, so pages never overlap or skip listings
+        queryset = JobListing.objects.order_by('-created_at', '-id')
         
         # Apply filters
         if keyword:
@@ -352,27 +500,11 @@ def get_job_listings(
         if location:
             queryset = queryset.filter(location__icontains=location)
         
-        # Apply pagination
-        queryset = queryset[offset:offset + limit]
-        
-        # Convert to schema
-        job_schemas = []
-        for job in queryset:
-            job_schemas.append(JobListingSchema(
-                job_id=job.job_id,
-                linkedin_url=job.linkedin_url,
-                title=job.title,
-                company_name=job.company_name,
-                location=job.location,
-                description=job.description,
-                employment_type=job.employment_type,
-                experience_level=job.experience_level,
-                posted_date=job.posted_date,
-                applicants_count=job.applicants_count,
-                company_logo_url=job.company_logo_url,
-            ))
-        
-        return job_schemas
+        # Apply pagination; the response schema validates the rows once
+        job_listings = list(_job_listing_values(queryset, full=full)[offset:offset + limit])
+        if cache_key:
+            cache.set(cache_key, job_listings, JOB_LISTINGS_PAGE_CACHE_TIMEOUT)
+        return job_listings
         
     except Exception as e:
         logger.error(f"Error getting job listings: {str(e)}")
@@ -391,21 +523,9 @@ def get_job_by_id(request, job_id: str):
         Job listing details
     """
     try:
-        job = JobListing.objects.get(job_id=job_id)
-        
-        return 200, JobListingSchema(
-            job_id=job.job_id,
-            linkedin_url=job.linkedin_url,
-            title=job.title,
-            company_name=job.company_name,
-            location=job.location,
-            description=job.description,
-            employment_type=job.employment_type,
-            experience_level=job.experience_level,
-            posted_date=job.posted_date,
-            applicants_count=job.applicants_count,
-            company_logo_url=job.company_logo_url,
-        )
+        job = JobListing.get_cached(job_id)
+        
+        return 200, _job_listing_schema(job)
         
     except JobListing.DoesNotExist:
         return 404, ErrorResponse(
@@ -428,26 +548,27 @@ def get_search_history(request, limit: int = 10):
     Get recent job search history
     
     Args:
-        limit: Maximum number of search records to return (default: 10)
+        limit: Maximum number of search records to return (default: 10, at most 100)
     
     Returns:
         List of recent job searches
     """
+    limit = max(1, min(limit, MAX_SEARCH_HISTORY_SIZE))
+    
     try:
-        searches = JobSearch.objects.all()[:limit]
-        
-        search_list = []
-        for search in searches:
-            search_list.append({
-                'id': search.id,
-                'keyword': search.keyword,
-                'location': search.location,
-                'job_types': search.job_types,
-                'experience_levels': search.experience_levels,
-                'total_results': search.total_results,
-                'results_fetched': search.results_fetched,
-                'created_at': search.created_at.isoformat(),
-            })
+        search_list = list(JobSearch.objects.values(
+            'id',
+            'keyword',
+            'location',
+            'job_types',
+            'experience_levels',
+            'total_results',
+            'results_fetched',
+            'created_at',
+        )[:limit])
+        
+        for search in search_list:
+            search['created_at'] = search['created_at'].isoformat()
         
         return search_list
         
@@ -485,8 +606,7 @@ def create_job_from_url(request, payload: CreateJobFromUrlRequest):
         # - https://at.linkedin.com/jobs/view/software-engineer-at-company-4309395824
         # - https://linkedin.com/jobs/view/4309395824?param=value
         
-        import re
-        job_id_match = re.search(r'/jobs/view/(?:[\w-]+?-)?(\d+)', linkedin_url)
+        job_id_match = LINKEDIN_JOB_ID_RE.search(linkedin_url)
         
         if not job_id_match:
             return 400, ErrorResponse(
@@ -498,28 +618,18 @@ def create_job_from_url(request, payload: CreateJobFromUrlRequest):
         job_id = job_id_match.group(1)
         logger.info(f"Extracted job ID {job_id} from URL: {linkedin_url}")
         
-        # Check if job already exists
-        existing_job = JobListing.objects.filter(job_id=job_id).first()
+        # Check if job already exists, fetching only the response columns. This
+        # reads the database, not the listing cache: a per-process cache can
+        # still hold a listing that the cleanup job deleted, and the import
+        # would then never store it again
+        existing_job = _job_listing_values(JobListing.objects.filter(job_id=job_id)).first()
         
         if existing_job:
             logger.info(f"Job {job_id} already exists in database")
-            return 200, JobListingSchema(
-                job_id=existing_job.job_id,
-                linkedin_url=existing_job.linkedin_url,
-                title=existing_job.title,
-                company_name=existing_job.company_name,
-                location=existing_job.location,
-                description=existing_job.description,
-                employment_type=existing_job.employment_type,
-                experience_level=existing_job.experience_level,
-                posted_date=existing_job.posted_date,
-                applicants_count=existing_job.applicants_count,
-                company_logo_url=existing_job.company_logo_url,
-            )
+            return 200, JobListingSchema(**existing_job)
         
         # Fetch job details from LinkedIn
-        scraper = LinkedInJobScraper()
-        job_details = scraper.get_job_details(job_id)
+        job_details = _get_job_details(job_id)
         
         if not job_details:
             return 500, ErrorResponse(
@@ -536,8 +646,8 @@ def create_job_from_url(request, payload: CreateJobFromUrlRequest):
                 details="Could not extract job title from LinkedIn page"
             )
         
-        # Create new job listing
-        job_listing = JobListing.objects.create(
+        # Upsert, so a concurrent import or search of the same job cannot fail this one
+        job_listing = JobListing(
             job_id=job_id,
             linkedin_url=job_details.get('linkedin_url', linkedin_url),
             title=job_details.get('title', 'Unknown'),
@@ -550,23 +660,12 @@ def create_job_from_url(request, payload: CreateJobFromUrlRequest):
             applicants_count=job_details.get('applicants_count'),
             company_logo_url=job_details.get('company_logo_url'),
         )
+        JobListing.bulk_upsert([job_listing])
         
         logger.info(f"Successfully created job listing for {job_id}: {job_listing.title}")
         
         # Return the created job
-        return 200, JobListingSchema(
-            job_id=job_listing.job_id,
-            linkedin_url=job_listing.linkedin_url,
-            title=job_listing.title,
-            company_name=job_listing.company_name,
-            location=job_listing.location,
-            description=job_listing.description,
-            employment_type=job_listing.employment_type,
-            experience_level=job_listing.experience_level,
-            posted_date=job_listing.posted_date,
-            applicants_count=job_listing.applicants_count,
-            company_logo_url=job_listing.company_logo_url,
-        )
+        return 200, _job_listing_schema(job_listing)
         
     except Exception as e:
         logger.error(f"Error creating job from URL: {str(e)}", exc_info=True)
@@ -737,23 +836,31 @@ def update_search_profile(request, profile_id: int, payload: UpdateSearchProfile
                 details=f"Search profile with ID {profile_id} not found or you don't have permission to access it"
             )
         
-        # Update fields if provided
+        # Update fields if provided, writing only the changed columns
+        update_fields = []
+        
         if payload.name is not None:
             profile.name = payload.name
+            update_fields.append('name')
         
         if payload.keyword is not None:
             profile.keyword = payload.keyword
+            update_fields.append('keyword')
         
         if payload.location is not None:
             profile.location = payload.location
+            update_fields.append('location')
         
         if payload.job_types is not None:
             profile.job_types = [jt.value for jt in payload.job_types]
+            update_fields.append('job_types')
         
         if payload.experience_levels is not None:
             profile.experience_levels = [el.value for el in payload.experience_levels]
+            update_fields.append('experience_levels')
         
-        profile.save()
+        if update_fields:
+            profile.save(update_fields=update_fields + ['updated_at'])
         
         logger.info(f"Updated search profile {profile.id} for user {user.username}")
         
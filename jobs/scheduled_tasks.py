@@ -30,7 +30,6 @@ scheduler.add_jobstore(DjangoJobStore(), "default")
     trigger=CronTrigger(hour=0, minute=0),  # Run every day at midnight
     id="cleanup_unused_jobs",
     name="Cleanup unused job listings",
-    replace_existing=True,
     max_instances=1,
 )
 @util.close_old_connections
@@ -55,7 +54,8 @@ def cleanup_unused_jobs():
 
 def start_scheduler():
     """
-    Start the scheduler. This is called when Django starts.
+    Start the scheduler. This is called by the run_scheduler management command
+    (or on Django startup when DJANGO_RUN_SCHEDULER=1).
     """
     try:
         # Register events to clean up old job executions
@@ -227,6 +227,7 @@ class JobApplicationListResponse(Schema):
     """Schema for listing job applications"""
     applications: List[JobApplicationSchema]
     count: int
+    next_cursor: Optional[str] = None  # Pass as `cursor` to fetch the next page
     
     class Config:
         schema_extra = {
@@ -244,7 +245,8 @@ class JobApplicationListResponse(Schema):
                         "updated_at": "2025-01-15T10:30:00Z"
                     }
                 ],
-                "count": 1
+                "count": 1,
+                "next_cursor": None
             }
         }
 
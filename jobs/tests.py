@@ -1,5 +1,19 @@
-from django.test import TestCase
-from .models import JobListing, JobSearch
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.contrib.postgres.search import SearchQuery
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from io import StringIO
+from ninja_jwt.tokens import RefreshToken
+from unittest import mock
+from .admin import JobApplicationAdmin, JobListingAdmin
+from .models import JOB_LISTING_SEARCH_VECTOR, JobListing, JobSearch, JobApplication, SearchProfile
+from .routers import ENRICHMENT_INTERVAL, _get_job_details
+
+User = get_user_model()
 
 
 class JobListingModelTest(TestCase):
@@ -29,6 +43,170 @@ class JobListingModelTest(TestCase):
         expected_str = "Test Data Scientist at Test Company"
         self.assertEqual(str(self.job), expected_str)
 
+    def test_bulk_upsert(self):
+        """Test bulk upsert inserts new listings and updates existing ones by job_id"""
+        listings = [
+            JobListing(
+                job_id="test123",
+                linkedin_url="https://www.linkedin.com/jobs/view/test123",
+                title="Senior Data Scientist",
+                company_name="Test Company",
+                location="Vienna, Austria",
+            ),
+            JobListing(
+                job_id="test456",
+                linkedin_url="https://www.linkedin.com/jobs/view/test456",
+                title="Data Engineer",
+                company_name="Other Company",
+                location="Graz, Austria",
+            ),
+        ]
+        with self.assertNumQueries(1):
+            JobListing.bulk_upsert(listings)
+
+        self.assertEqual(JobListing.objects.count(), 2)
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.title, "Senior Data Scientist")
+
+    @override_settings(SHARED_CACHE=True)
+    def test_get_cached(self):
+        """Test cached reads skip the database and are invalidated on save"""
+        cache.clear()
+        JobListing.get_cached("test123")
+        with self.assertNumQueries(0):
+            self.assertEqual(JobListing.get_cached("test123").title, "Test Data Scientist")
+
+        self.job.title = "Lead Data Scientist"
+        self.job.save()
+        self.assertEqual(JobListing.get_cached("test123").title, "Lead Data Scientist")
+
+    @override_settings(SHARED_CACHE=False)
+    def test_get_cached_without_shared_cache(self):
+        """Test listings deleted by another process are not served from a per-process cache"""
+        cache.clear()
+        JobListing.get_cached("test123")
+        # Deleted without signals, as by the cleanup command in the scheduler
+        with connection.cursor() as cursor:
+            cursor.execute("DELETE FROM jobs_joblisting WHERE job_id = %s", ["test123"])
+
+        with self.assertRaises(JobListing.DoesNotExist):
+            JobListing.get_cached("test123")
+
+
+class JobListingAdminSearchTest(TestCase):
+    """Test cases for the admin search on job listings"""
+    
+    def setUp(self):
+        """Set up test data"""
+        JobListing.objects.create(
+            job_id="111",
+            linkedin_url="https://www.linkedin.com/jobs/view/111",
+            title="Python Developer",
+            company_name="Acme",
+            location="Vienna, Austria",
+        )
+        JobListing.objects.create(
+            job_id="222",
+            linkedin_url="https://www.linkedin.com/jobs/view/222",
+            title="Head Chef",
+            company_name="Bistro",
+            location="Graz, Austria",
+        )
+        self.admin = JobListingAdmin(JobListing, admin.site)
+    
+    def _search(self, term):
+        queryset, may_have_duplicates = self.admin.get_search_results(None, JobListing.objects.all(), term)
+        return sorted(queryset.values_list('job_id', flat=True))
+    
+    def test_full_text_search(self):
+        """Test search terms are matched against stemmed listing text"""
+        self.assertEqual(self._search("python developers"), ["111"])
+        self.assertEqual(self._search("austria"), ["111", "222"])
+    
+    def test_search_by_job_id(self):
+        """Test exact job IDs are still searchable"""
+        self.assertEqual(self._search("222"), ["222"])
+    
+    def test_partial_terms(self):
+        """Test partial words and job IDs still match by substring"""
+        self.assertEqual(self._search("Pyth"), ["111"])
+        self.assertEqual(self._search("Bist"), ["222"])
+        self.assertEqual(self._search("22"), ["222"])
+    
+    def test_full_text_matches_description(self):
+        """Test the description is matched through the full-text index"""
+        JobListing.objects.filter(job_id="222").update(description="Seasonal kitchens")
+        self.assertEqual(self._search("kitchen"), ["222"])
+    
+    def test_search_uses_indexes(self):
+        """Test every arm of the admin search is answered from an index"""
+        with connection.cursor() as cursor:
+            # Tiny test tables would otherwise always be scanned sequentially
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute("SELECT indexname FROM pg_indexes WHERE indexname LIKE 'joblisting_%%_trgm'")
+            trigram_indexes = {row[0] for row in cursor.fetchall()}
+        
+        # Without the admin ordering, so the plan shows how rows are found
+        full_text = JobListing.objects.alias(search=JOB_LISTING_SEARCH_VECTOR).filter(
+            search=SearchQuery("python", config='english', search_type='websearch')
+        )
+        self.assertIn("joblisting_search_vector_gin", full_text.order_by().explain())
+        
+        if not trigram_indexes:
+            self.skipTest("pg_trgm is not available, so the substring arms cannot use an index")
+        queryset, may_have_duplicates = self.admin.get_search_results(None, JobListing.objects.all(), "python")
+        plan = queryset.order_by().explain()
+        self.assertNotIn("Seq Scan", plan)
+        for index in (
+            "joblisting_job_id_trgm",
+            "joblisting_title_trgm",
+            "joblisting_company_name_trgm",
+            "joblisting_location_trgm",
+            "joblisting_search_vector_gin",
+        ):
+            self.assertIn(index, plan)
+
+
+class JobApplicationAdminSearchTest(TestCase):
+    """Test cases for the admin search on job applications"""
+    
+    def setUp(self):
+        """Set up test data"""
+        self.user = User.objects.create_user(username="alice", email="alice@example.com", password="x")
+        other = User.objects.create_user(username="bob", password="x")
+        JobApplication.objects.create(user=self.user, job_title="Python Developer", company_name="Acme")
+        JobApplication.objects.create(user=other, job_title="Head Chef", company_name="Bistro")
+        self.admin = JobApplicationAdmin(JobApplication, admin.site)
+    
+    def _search(self, term):
+        queryset, may_have_duplicates = self.admin.get_search_results(None, JobApplication.objects.all(), term)
+        return sorted(queryset.values_list('job_title', flat=True))
+    
+    def test_partial_title_and_company(self):
+        """Test job titles and companies match by substring"""
+        self.assertEqual(self._search("pyth"), ["Python Developer"])
+        self.assertEqual(self._search("Bist"), ["Head Chef"])
+    
+    def test_exact_user(self):
+        """Test applications are found by exact username or email"""
+        self.assertEqual(self._search("alice"), ["Python Developer"])
+        self.assertEqual(self._search("ALICE@example.com"), ["Python Developer"])
+        self.assertEqual(self._search("ali"), [])
+    
+    def test_search_uses_indexes(self):
+        """Test every arm of the admin search is answered from an index"""
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute("SELECT indexname FROM pg_indexes WHERE indexname LIKE 'jobapplication_%%_trgm'")
+            if not cursor.fetchall():
+                self.skipTest("pg_trgm is not available, so the substring arms cannot use an index")
+        
+        queryset, may_have_duplicates = self.admin.get_search_results(None, JobApplication.objects.all(), "alice")
+        plan = queryset.order_by().explain()
+        self.assertNotIn("Seq Scan", plan)
+        for index in ("jobapplication_job_title_trgm", "jobapplication_company_name_trgm", "jobapp_user_appliedat_idx"):
+            self.assertIn(index, plan)
+
 
 class JobSearchModelTest(TestCase):
     """Test cases for JobSearch model"""
@@ -54,3 +232,506 @@ class JobSearchModelTest(TestCase):
         """Test search string representation"""
         expected_str = "Search: Data Scientist in Vienna"
         self.assertEqual(str(self.search), expected_str)
+
+
+class JobListingsEndpointTest(TestCase):
+    """Test cases for the job listings endpoint"""
+    
+    def setUp(self):
+        """Set up test data"""
+        cache.clear()
+        JobListing.objects.create(
+            job_id="111",
+            linkedin_url="https://www.linkedin.com/jobs/view/111",
+            title="Python Developer",
+            company_name="Acme",
+            location="Vienna, Austria",
+            description="Django and PostgreSQL",
+        )
+        JobListing.objects.create(
+            job_id="222",
+            linkedin_url="https://www.linkedin.com/jobs/view/222",
+            title="Head Chef",
+            company_name="Bistro",
+            location="Graz, Austria",
+        )
+    
+    def test_listings_filtered(self):
+        """Test listings are filtered by keyword and returned with all schema fields"""
+        response = self.client.get("/api/jobs/listings?keyword=python")
+        
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(len(data), 1)
+        self.assertEqual(data[0]["job_id"], "111")
+        self.assertEqual(data[0]["description"], "Django and PostgreSQL")
+        self.assertIsNone(data[0]["posted_date"])
+    
+    def test_listings_without_description(self):
+        """Test summary listings leave out the description"""
+        response = self.client.get("/api/jobs/listings?keyword=python&full=false")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()[0]["title"], "Python Developer")
+        self.assertIsNone(response.json()[0]["description"])
+    
+    def test_listings_limit_capped(self):
+        """Test oversized limits and negative offsets are clamped"""
+        with mock.patch("jobs.routers.MAX_JOB_LISTINGS_PAGE_SIZE", 1):
+            response = self.client.get("/api/jobs/listings?limit=1000000&offset=-5")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 1)
+    
+    def test_listings_pages_stable_for_equal_timestamps(self):
+        """Test listings created at the same instant are split across pages without overlap"""
+        JobListing.objects.update(created_at=JobListing.objects.first().created_at)
+        first = self.client.get("/api/jobs/listings?limit=1&offset=0").json()
+        second = self.client.get("/api/jobs/listings?limit=1&offset=1").json()
+        self.assertEqual([first[0]["job_id"], second[0]["job_id"]], ["222", "111"])
+    
+    def test_get_listing_by_id(self):
+        """Test a single listing is returned by job ID"""
+        response = self.client.get("/api/jobs/listings/111")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["company_name"], "Acme")
+        
+        response = self.client.get("/api/jobs/listings/999")
+        self.assertEqual(response.status_code, 404)
+    
+    @override_settings(SHARED_CACHE=True)
+    def test_listings_cached_until_new_job_stored(self):
+        """Test listing pages are served from a shared cache and refreshed when listings change"""
+        self.client.get("/api/jobs/listings")
+        with self.assertNumQueries(0):
+            response = self.client.get("/api/jobs/listings")
+        self.assertEqual(len(response.json()), 2)
+        
+        JobListing.bulk_upsert([
+            JobListing(
+                job_id="333",
+                linkedin_url="https://www.linkedin.com/jobs/view/333",
+                title="Data Engineer",
+                company_name="Initech",
+                location="Linz, Austria",
+            ),
+        ])
+        response = self.client.get("/api/jobs/listings")
+        self.assertEqual(len(response.json()), 3)
+    
+    @override_settings(SHARED_CACHE=False)
+    def test_listings_not_cached_per_process(self):
+        """Test listing pages always read the database without a shared cache"""
+        self.client.get("/api/jobs/listings")
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/jobs/listings")
+        self.assertEqual(len(response.json()), 2)
+
+
+class CreateJobFromUrlEndpointTest(TestCase):
+    """Test cases for creating a job listing from a LinkedIn URL"""
+    
+    def setUp(self):
+        """Set up test data"""
+        cache.clear()
+    
+    def _create(self, linkedin_url):
+        return self.client.post(
+            "/api/jobs/create-from-url",
+            data={"linkedin_url": linkedin_url},
+            content_type="application/json",
+        )
+    
+    def test_invalid_url_rejected(self):
+        """Test URLs without a job ID are rejected"""
+        response = self._create("https://www.linkedin.com/company/acme")
+        self.assertEqual(response.status_code, 400)
+    
+    @mock.patch("jobs.routers._get_scraper")
+    def test_existing_job_returned_for_slug_url(self, mock_get_scraper):
+        """Test the job ID is parsed from slugged URLs and known jobs are not scraped again"""
+        JobListing.objects.create(
+            job_id="4309395824",
+            linkedin_url="https://www.linkedin.com/jobs/view/4309395824",
+            title="Software Engineer",
+            company_name="Acme",
+            location="Vienna, Austria",
+        )
+        
+        response = self._create("https://at.linkedin.com/jobs/view/software-engineer-at-acme-4309395824?trk=x")
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["job_id"], "4309395824")
+        mock_get_scraper.assert_not_called()
+    
+    @override_settings(SHARED_CACHE=True)
+    @mock.patch("jobs.routers._get_job_details")
+    def test_job_deleted_elsewhere_stored_again(self, mock_get_job_details):
+        """Test a listing still cached after being deleted by another process is imported again"""
+        mock_get_job_details.return_value = {
+            "title": "Software Engineer",
+            "company_name": "Acme",
+            "location": "Vienna, Austria",
+        }
+        JobListing.objects.create(
+            job_id="4309395824",
+            linkedin_url="https://www.linkedin.com/jobs/view/4309395824",
+            title="Software Engineer",
+            company_name="Acme",
+            location="Vienna, Austria",
+        )
+        JobListing.get_cached("4309395824")
+        # Deleted without signals, as the cleanup command in the scheduler does
+        with connection.cursor() as cursor:
+            cursor.execute("DELETE FROM jobs_joblisting WHERE job_id = %s", ["4309395824"])
+        
+        response = self._create("https://www.linkedin.com/jobs/view/4309395824")
+        
+        self.assertEqual(response.status_code, 200)
+        mock_get_job_details.assert_called_once_with("4309395824")
+        self.assertTrue(JobListing.objects.filter(job_id="4309395824").exists())
+    
+    @mock.patch("jobs.routers._get_job_details")
+    def test_concurrently_stored_job_upserted(self, mock_get_job_details):
+        """Test a job stored by another request after the existence check does not fail the import"""
+        def get_job_details(job_id):
+            # Simulate the race: another request stores the job while this one scrapes it
+            JobListing.objects.create(
+                job_id=job_id,
+                linkedin_url=f"https://www.linkedin.com/jobs/view/{job_id}",
+                title="Software Engineer",
+                company_name="Acme",
+                location="Vienna, Austria",
+            )
+            return {
+                "title": "Senior Software Engineer",
+                "company_name": "Acme",
+                "location": "Vienna, Austria",
+            }
+        
+        mock_get_job_details.side_effect = get_job_details
+        
+        response = self._create("https://www.linkedin.com/jobs/view/4309395824")
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["title"], "Senior Software Engineer")
+        self.assertEqual(JobListing.objects.filter(job_id="4309395824").count(), 1)
+
+
+class SearchJobsEndpointTest(TestCase):
+    """Test cases for the profile based job search endpoint"""
+    
+    def setUp(self):
+        """Set up test data"""
+        self.user = User.objects.create_user(username="searcher", password="x")
+        access = RefreshToken.for_user(self.user).access_token
+        self.auth_header = {"HTTP_AUTHORIZATION": f"Bearer {access}"}
+        SearchProfile.objects.create(user=self.user, keyword="Python", location="Vienna")
+        JobListing.objects.create(
+            job_id="111",
+            linkedin_url="https://www.linkedin.com/jobs/view/111",
+            title="Python Developer",
+            company_name="Acme",
+            location="Vienna, Austria",
+        )
+    
+    @mock.patch("jobs.routers._get_scraper")
+    def test_search_stores_new_jobs_in_bulk(self, mock_get_scraper):
+        """Test only unknown jobs are enriched and all results come back in a fixed number of queries"""
+        scraper = mock_get_scraper.return_value
+        scraper.search_jobs.return_value = [{"job_id": "111"}, {"job_id": "222"}]
+        scraper.get_job_details.return_value = {
+            "title": "Backend Engineer",
+            "company_name": "Initech",
+            "location": "Vienna, Austria",
+        }
+        
+        # auth user, profiles, existing job ids, upsert (savepoint + release), result listings
+        with self.assertNumQueries(7):
+            response = self.client.post(
+                "/api/jobs/search",
+                data={"limit": 10},
+                content_type="application/json",
+                **self.auth_header,
+            )
+        
+        self.assertEqual(response.status_code, 200)
+        scraper.get_job_details.assert_called_once_with("222")
+        self.assertEqual({job["job_id"] for job in response.json()["jobs"]}, {"111", "222"})
+    
+    @mock.patch("jobs.routers._linkedin_next_request", 0.0)
+    @mock.patch("jobs.routers.time.sleep")
+    @mock.patch("jobs.routers._get_scraper")
+    def test_detail_requests_throttled(self, mock_get_scraper, mock_sleep):
+        """Test consecutive detail requests are spaced by the enrichment interval"""
+        for job_id in ("1", "2", "3"):
+            _get_job_details(job_id)
+        
+        waits = [call.args[0] for call in mock_sleep.call_args_list]
+        for wait, expected in zip(waits, [0, ENRICHMENT_INTERVAL, 2 * ENRICHMENT_INTERVAL]):
+            self.assertAlmostEqual(wait, expected, delta=0.5)
+        self.assertEqual(mock_get_scraper.return_value.get_job_details.call_count, 3)
+    
+    @mock.patch("jobs.routers.ENRICHMENT_INTERVAL", 0)
+    @mock.patch("jobs.routers._get_scraper")
+    def test_failed_enrichment_skipped(self, mock_get_scraper):
+        """Test a job whose details cannot be fetched does not fail the other jobs"""
+        scraper = mock_get_scraper.return_value
+        scraper.search_jobs.return_value = [{"job_id": "222"}, {"job_id": "333"}]
+        
+        def get_job_details(job_id):
+            if job_id == "222":
+                raise ConnectionError("blocked")
+            return {"title": "Data Engineer", "company_name": "Initech", "location": "Linz"}
+        
+        scraper.get_job_details.side_effect = get_job_details
+        
+        response = self.client.post(
+            "/api/jobs/search",
+            data={"limit": 10},
+            content_type="application/json",
+            **self.auth_header,
+        )
+        
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual([job["job_id"] for job in data["jobs"]], ["333"])
+        self.assertEqual(data["search_params"]["failed"], 1)
+    
+    @mock.patch("jobs.routers.ENRICHMENT_INTERVAL", 0)
+    @mock.patch("jobs.routers._get_scraper")
+    def test_invalid_listing_skipped_when_storing(self, mock_get_scraper):
+        """Test one listing the database rejects does not fail the rest of the batch"""
+        scraper = mock_get_scraper.return_value
+        scraper.search_jobs.return_value = [{"job_id": "222"}, {"job_id": "333"}, {"job_id": "444"}]
+        
+        def get_job_details(job_id):
+            # Longer than JobListing.title allows
+            title = "x" * 600 if job_id == "333" else f"Engineer {job_id}"
+            return {"title": title, "company_name": "Initech", "location": "Linz"}
+        
+        scraper.get_job_details.side_effect = get_job_details
+        
+        response = self.client.post(
+            "/api/jobs/search",
+            data={"limit": 10},
+            content_type="application/json",
+            **self.auth_header,
+        )
+        
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual({job["job_id"] for job in data["jobs"]}, {"222", "444"})
+        self.assertEqual(data["search_params"]["enriched"], 2)
+        self.assertEqual(data["search_params"]["failed"], 1)
+
+
+class JobApplicationEndpointTest(TestCase):
+    """Test cases for the job application endpoints"""
+    
+    def setUp(self):
+        """Set up test data"""
+        self.user = User.objects.create_user(username="applicant", password="x")
+        access = RefreshToken.for_user(self.user).access_token
+        self.auth_header = {"HTTP_AUTHORIZATION": f"Bearer {access}"}
+        cache.clear()
+        self.job = JobListing.objects.create(
+            job_id="job123",
+            linkedin_url="https://www.linkedin.com/jobs/view/job123",
+            title="Backend Engineer",
+            company_name="Acme",
+            location="Vienna, Austria",
+        )
+    
+    def _create(self, **data):
+        return self.client.post(
+            "/api/applications/",
+            data=data,
+            content_type="application/json",
+            **self.auth_header,
+        )
+    
+    def test_list_applications(self):
+        """Test applications are listed with the linked job id"""
+        JobApplication.objects.create(
+            user=self.user, job_listing=self.job, job_title="Backend Engineer", company_name="Acme"
+        )
+        JobApplication.objects.create(user=self.user, job_title="Data Engineer", company_name="Initech")
+        
+        response = self.client.get("/api/applications/", **self.auth_header)
+        
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["count"], 2)
+        job_ids = {app["job_title"]: app["job_id"] for app in data["applications"]}
+        self.assertEqual(job_ids, {"Backend Engineer": "job123", "Data Engineer": None})
+
+    def test_manager_joins_relations(self):
+        """Test iterating applications does not query the user or job listing per row"""
+        JobApplication.objects.create(
+            user=self.user, job_listing=self.job, job_title="Backend Engineer", company_name="Acme"
+        )
+        JobApplication.objects.create(user=self.user, job_title="Data Engineer", company_name="Initech")
+
+        with self.assertNumQueries(1):
+            labels = [(str(app), app.job_listing) for app in JobApplication.objects.all()]
+        self.assertEqual(len(labels), 2)
+        self.assertNotIn("description", str(JobApplication.objects.all().query))
+
+    def test_list_applications_paginated(self):
+        """Test the cursor walks through all applications without overlap"""
+        for i in range(5):
+            JobApplication.objects.create(user=self.user, job_title=f"Job {i}", company_name="Acme")
+        
+        seen = []
+        url = "/api/applications/?limit=2"
+        while url:
+            data = self.client.get(url, **self.auth_header).json()
+            seen += [app["job_title"] for app in data["applications"]]
+            url = f"/api/applications/?limit=2&cursor={data['next_cursor']}" if data["next_cursor"] else None
+        
+        self.assertEqual(seen, [f"Job {i}" for i in reversed(range(5))])
+    
+    def test_list_applications_invalid_cursor(self):
+        """Test malformed cursors are rejected"""
+        response = self.client.get("/api/applications/?cursor=garbage", **self.auth_header)
+        self.assertEqual(response.status_code, 400)
+    
+    def test_get_application(self):
+        """Test a single application is returned only to its owner"""
+        application = JobApplication.objects.create(
+            user=self.user, job_listing=self.job, job_title="Backend Engineer", company_name="Acme"
+        )
+        other = User.objects.create_user(username="other", password="x")
+        foreign = JobApplication.objects.create(user=other, job_title="Chef", company_name="Bistro")
+        
+        response = self.client.get(f"/api/applications/{application.id}", **self.auth_header)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["job_id"], "job123")
+        
+        response = self.client.get(f"/api/applications/{foreign.id}", **self.auth_header)
+        self.assertEqual(response.status_code, 404)
+    
+    def test_update_status_writes_only_status(self):
+        """Test a status update writes only the status column"""
+        application = JobApplication.objects.create(
+            user=self.user, job_title="Backend Engineer", company_name="Acme", notes="Referred"
+        )
+        
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(
+                f"/api/applications/{application.id}/status",
+                data={"status": "phone_screening"},
+                content_type="application/json",
+                **self.auth_header,
+            )
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["application"]["status"], "phone_screening")
+        update_sql = next(q["sql"] for q in queries if q["sql"].startswith("UPDATE"))
+        self.assertIn('"status"', update_sql)
+        self.assertNotIn('"notes"', update_sql)
+    
+    def test_duplicate_custom_application_rejected(self):
+        """Test custom applications are deduplicated by URL or title and company"""
+        JobApplication.objects.create(
+            user=self.user,
+            job_title="Data Engineer",
+            company_name="Initech",
+            job_url="https://example.com/jobs/1",
+        )
+        
+        by_url = self._create(job_title="Other", company_name="Other", job_url="https://example.com/jobs/1")
+        by_title = self._create(job_title="Data Engineer", company_name="Initech")
+        
+        self.assertEqual(by_url.status_code, 400)
+        self.assertTrue(by_url.json()["details"].startswith("You have already applied to this job"))
+        self.assertEqual(by_title.status_code, 400)
+        self.assertIn("Data Engineer at Initech", by_title.json()["details"])
+        
+        created = self._create(job_title="Data Engineer", company_name="Globex")
+        self.assertEqual(created.status_code, 201)
+    
+    def test_create_linked_application(self):
+        """Test applying to a stored job listing once"""
+        # User lookup, listing + duplicate check, insert
+        with self.assertNumQueries(3):
+            response = self._create(job_id="job123", job_title="Backend Engineer", company_name="Acme")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["application"]["job_id"], "job123")
+
+        duplicate = self._create(job_id="job123", job_title="Backend Engineer", company_name="Acme")
+        self.assertEqual(duplicate.status_code, 400)
+
+        missing = self._create(job_id="missing", job_title="Backend Engineer", company_name="Acme")
+        self.assertEqual(missing.status_code, 404)
+
+    def test_check_application_after_create(self):
+        """Test the check reflects an application created right after a negative check"""
+        check_url = "/api/applications/check?job_title=Data%20Engineer&company_name=Initech"
+        self.assertFalse(self.client.get(check_url, **self.auth_header).json()["has_applied"])
+        
+        self._create(job_title="Data Engineer", company_name="Initech")
+        
+        self.assertTrue(self.client.get(check_url, **self.auth_header).json()["has_applied"])
+    
+    def test_check_application_by_job_id(self):
+        """Test the check endpoint resolves job ids through the listing join"""
+        JobApplication.objects.create(
+            user=self.user, job_listing=self.job, job_title="Backend Engineer", company_name="Acme"
+        )
+        
+        applied = self.client.get("/api/applications/check?job_id=job123", **self.auth_header)
+        missing = self.client.get("/api/applications/check?job_id=missing", **self.auth_header)
+        
+        self.assertTrue(applied.json()["has_applied"])
+        self.assertFalse(missing.json()["has_applied"])
+    
+    def test_check_application_requires_parameters(self):
+        """Test the check endpoint rejects calls without a job identifier"""
+        response = self.client.get("/api/applications/check?job_title=Data%20Engineer", **self.auth_header)
+        
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["error"], "Invalid parameters")
+
+
+class CleanupUnusedJobsCommandTest(TestCase):
+    """Test cases for the cleanup_unused_jobs management command"""
+    
+    def setUp(self):
+        """Set up test data"""
+        user = User.objects.create_user(username="cleaner", password="x")
+        for job_id in ["applied", "unused1", "unused2", "unused3"]:
+            JobListing.objects.create(
+                job_id=job_id,
+                linkedin_url=f"https://www.linkedin.com/jobs/view/{job_id}",
+                title="Engineer",
+                company_name="Acme",
+                location="Vienna",
+            )
+        JobApplication.objects.create(
+            user=user,
+            job_listing=JobListing.objects.get(job_id="applied"),
+            job_title="Engineer",
+            company_name="Acme",
+        )
+    
+    def test_deletes_unused_listings_in_batches(self):
+        """Test only listings without applications are deleted"""
+        out = StringIO()
+        call_command('cleanup_unused_jobs', batch_size=2, stdout=out)
+        
+        self.assertEqual(list(JobListing.objects.values_list('job_id', flat=True)), ["applied"])
+        self.assertIn("Successfully deleted 3 unused job listing(s)", out.getvalue())
+    
+    def test_dry_run_keeps_listings(self):
+        """Test a dry run reports the exact number without deleting anything"""
+        out = StringIO()
+        call_command('cleanup_unused_jobs', dry_run=True, verbose=True, stdout=out)
+        self.assertEqual(JobListing.objects.count(), 4)
+        self.assertIn("Would delete 3 job listing(s)", out.getvalue())
+    
+    def test_rejects_non_positive_batch_size(self):
+        """Test a batch size below one is rejected instead of looping forever"""
+        for batch_size in (0, -5):
+            with self.assertRaises(CommandError):
+                call_command('cleanup_unused_jobs', batch_size=batch_size, stdout=StringIO())
+        self.assertEqual(JobListing.objects.count(), 4)
@@ -135,7 +135,7 @@ def create_cover_letter(request, payload: CreateCoverLetterRequest):
     
     # Fetch job
     try:
-        job = JobListing.objects.get(job_id=payload.job_id)
+        job = JobListing.get_cached(payload.job_id)
     except JobListing.DoesNotExist:
         raise HttpError(404, "Job not found")
     